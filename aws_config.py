@@ -8,16 +8,30 @@ Handles creation of resources and utility functions.
 """
 
 import os
-import boto3
 import time
 import logging
 import json
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from requests_aws4auth import AWS4Auth
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# orjson is much faster than the stdlib json module; fall back if it isn't installed
+try:
+    import orjson
+
+    def _dump_json(obj, indent=False):
+        """Serialize obj to JSON bytes"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+
+    _load_json = orjson.loads
+except ImportError:
+    def _dump_json(obj, indent=False):
+        """Serialize obj to JSON bytes"""
+        return json.dumps(obj, indent=2 if indent else None).encode()
+
+    _load_json = json.loads
+
 logger = logging.getLogger(__name__)
 
 # AWS Credentials - load from environment variables
@@ -25,13 +39,34 @@ AWS_ACCESS_KEY = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_SECRET_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.environ.get("AWS_REGION", "eu-north-1")
 
+# Credentials come from the environment, so don't let botocore probe the
+# EC2 instance metadata service (which can block for seconds off EC2)
+if AWS_ACCESS_KEY and AWS_SECRET_KEY:
+    os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+
 # SQS Configuration
 SQS_CRAWLER_QUEUE_NAME = "webcrawler-crawler-queue"
 SQS_INDEXER_QUEUE_NAME = "webcrawler-indexer-queue"
+SQS_EVENTS_QUEUE_NAME = "webcrawler-events-queue"  # S3 ObjectCreated notifications for output/
+SQS_WAIT_TIME_SECONDS = "20"  # Long polling wait, the SQS maximum
+
+# Celery broker URL; credentials come from the environment through boto3's default
+# chain rather than the URL, so the secret never appears in connection reprs
+CELERY_BROKER_URL = "sqs://"
+
+# How long a received message stays hidden before SQS redelivers it (e.g. after a
+# worker crash): crawl fetches are short but up to 10 are prefetched per worker,
+# indexing jobs run longer
+SQS_VISIBILITY_TIMEOUTS = {
+    SQS_CRAWLER_QUEUE_NAME: "120",
+    SQS_INDEXER_QUEUE_NAME: "600",
+    SQS_EVENTS_QUEUE_NAME: "30",
+}
 
 # DynamoDB Configuration
 DYNAMODB_TABLE_NAME = "webcrawler-tasks"
 DYNAMODB_RESULTS_TTL = 86400  # 24 hours in seconds
+DYNAMODB_CONTENT_COUNTER_ID = "stats#content_count"  # Item counting pages stored in S3
 
 # S3 Configuration
 S3_BUCKET_NAME = "webcrawler-content-marwan"
@@ -39,11 +74,67 @@ S3_INPUT_PREFIX = "input/"  # Prefix for input content
 S3_OUTPUT_PREFIX = "output/"  # Prefix for output content
 S3_CONFIG_PREFIX = "config/"  # Prefix for configuration
 
+# OpenSearch auth method cache (seeded from OPENSEARCH_AUTH_METHOD_FILE)
+OPENSEARCH_AUTH_METHOD_FILE = "opensearch_auth_method.txt"
+OPENSEARCH_AUTH_CACHE_TTL = 3600  # 1 hour in seconds
+_opensearch_auth_cache = {'method': None, 'ts': 0}
+
+# HTTP session and AWS4Auth signer reused across OpenSearch probes
+_os_session = None
+_aws4auth = None
+
 # Connection clients
 sqs_client = None
 dynamodb_client = None
 s3_client = None
 
+# Client configuration: larger connection pool, TCP keep-alive and adaptive retries.
+# read_timeout is left at the botocore default so SQS long polls (20s) are not cut short.
+# Clients are thread-safe and shared by thread pools (e.g. 16 purge workers), so the
+# pool is sized to give every worker its own connection.
+BOTO_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    connect_timeout=3,
+    retries={'max_attempts': 10, 'mode': 'adaptive'}
+)
+
+# Poll DynamoDB table status every 2s instead of the waiter default of 20s
+DYNAMODB_WAITER_CONFIG = {'Delay': 2, 'MaxAttempts': 30}
+
+# Shared boto3 session and per-service client cache
+_session = None
+_clients = {}
+
+# Set once the client globals above are populated
+_init_lock = threading.Lock()
+_initialized = False
+
+# Queue URLs never change, so they are looked up once per process
+_queue_url_cache = {}
+
+# Stored pages counted in this process but not yet added to the counter item,
+# and the process running the thread that adds them
+CONTENT_COUNT_FLUSH_INTERVAL = 5
+_pending_content_count = 0
+_content_count_lock = threading.Lock()
+_content_count_flusher_pid = None
+
+def _get_client(name):
+    """Return the process-wide client for an AWS service, creating it on first use"""
+    global _session
+    if name not in _clients:
+        if _session is None:
+            # Imported here so processes that never talk to AWS skip the boto3 import cost
+            import boto3
+            _session = boto3.Session(
+                aws_access_key_id=AWS_ACCESS_KEY,
+                aws_secret_access_key=AWS_SECRET_KEY,
+                region_name=AWS_REGION
+            )
+        _clients[name] = _session.client(name, config=BOTO_CONFIG)
+    return _clients[name]
+
 def init_aws_clients():
     """Initialize AWS clients with credentials"""
     global sqs_client, dynamodb_client, s3_client
@@ -53,17 +144,10 @@ def init_aws_clients():
         return False
 
     try:
-        # Create session with credentials
-        session = boto3.Session(
-            aws_access_key_id=AWS_ACCESS_KEY,
-            aws_secret_access_key=AWS_SECRET_KEY,
-            region_name=AWS_REGION
-        )
-
-        # Create clients
-        sqs_client = session.client('sqs')
-        dynamodb_client = session.client('dynamodb')
-        s3_client = session.client('s3')
+        # Reuse the shared clients (created once per process)
+        sqs_client = _get_client('sqs')
+        dynamodb_client = _get_client('dynamodb')
+        s3_client = _get_client('s3')
 
         logger.info("AWS clients initialized successfully")
         return True
@@ -72,6 +156,13 @@ def init_aws_clients():
         logger.error(f"Failed to initialize AWS clients: {e}")
         return False
 
+def _has_id_key_schema(table):
+    """Check whether a described table is keyed on 'id' as the Celery backend expects"""
+    return any(
+        key['AttributeName'] == 'id' and key['KeyType'] == 'HASH'
+        for key in table.get('KeySchema', [])
+    )
+
 def fix_dynamodb_table(force_recreate=False):
     """Fix the DynamoDB table schema to work with Celery"""
     try:
@@ -90,12 +181,12 @@ def fix_dynamodb_table(force_recreate=False):
                 dynamodb_client.delete_table(TableName=DYNAMODB_TABLE_NAME)
 
                 waiter = dynamodb_client.get_waiter('table_not_exists')
-                waiter.wait(TableName=DYNAMODB_TABLE_NAME)
+                waiter.wait(TableName=DYNAMODB_TABLE_NAME, WaiterConfig=DYNAMODB_WAITER_CONFIG)
                 logger.info(f"Table {DYNAMODB_TABLE_NAME} deleted successfully")
                 table_exists = False
-            else:
-                # Check if the table has the correct schema
-                # Look for 'id' attribute and 'expires' TTL
+            elif _has_id_key_schema(response['Table']):
+                # Key schema is already correct, only make sure TTL is enabled.
+                # Never delete a table with the right schema: that destroys data.
                 try:
                     ttl_response = dynamodb_client.describe_time_to_live(
                         TableName=DYNAMODB_TABLE_NAME
@@ -110,9 +201,8 @@ def fix_dynamodb_table(force_recreate=False):
                     # If table has correct schema, just return
                     if has_correct_ttl:
                         logger.info(f"Table {DYNAMODB_TABLE_NAME} has correct schema, no changes needed")
-                        return True
                     else:
-                        logger.info(f"Table {DYNAMODB_TABLE_NAME} has incorrect schema, updating TTL")
+                        logger.info(f"Table {DYNAMODB_TABLE_NAME} has incorrect TTL, updating TTL")
                         # Just update the TTL instead of recreating
                         dynamodb_client.update_time_to_live(
                             TableName=DYNAMODB_TABLE_NAME,
@@ -122,10 +212,11 @@ def fix_dynamodb_table(force_recreate=False):
                             }
                         )
                         logger.info(f"Updated TTL for {DYNAMODB_TABLE_NAME}")
-                        return True
                 except Exception as e:
-                    logger.warning(f"Error checking TTL: {e}. Will recreate table.")
-                    # Continue to recreation
+                    logger.warning(f"Error checking TTL on {DYNAMODB_TABLE_NAME}: {e}")
+                return True
+            else:
+                logger.info(f"Table {DYNAMODB_TABLE_NAME} has incorrect key schema, will recreate it")
         except ClientError as e:
             if e.response['Error']['Code'] != 'ResourceNotFoundException':
                 logger.error(f"Error checking table: {e}")
@@ -134,19 +225,19 @@ def fix_dynamodb_table(force_recreate=False):
 
         # Only get here if table doesn't exist or needs to be recreated
 
-        # If table exists, delete it first
-        try:
-            dynamodb_client.describe_table(TableName=DYNAMODB_TABLE_NAME)
-            logger.info(f"Deleting existing table {DYNAMODB_TABLE_NAME} to recreate with correct schema")
-            dynamodb_client.delete_table(TableName=DYNAMODB_TABLE_NAME)
-
-            # Wait for the table to be deleted
-            waiter = dynamodb_client.get_waiter('table_not_exists')
-            waiter.wait(TableName=DYNAMODB_TABLE_NAME)
-            logger.info(f"Table {DYNAMODB_TABLE_NAME} deleted successfully")
-        except ClientError as e:
-            if e.response['Error']['Code'] != 'ResourceNotFoundException':
-                logger.error(f"Error deleting table: {e}")
+        # If table exists with the wrong schema, delete it first
+        if table_exists:
+            try:
+                logger.info(f"Deleting existing table {DYNAMODB_TABLE_NAME} to recreate with correct schema")
+                dynamodb_client.delete_table(TableName=DYNAMODB_TABLE_NAME)
+
+                # Wait for the table to be deleted
+                waiter = dynamodb_client.get_waiter('table_not_exists')
+                waiter.wait(TableName=DYNAMODB_TABLE_NAME, WaiterConfig=DYNAMODB_WAITER_CONFIG)
+                logger.info(f"Table {DYNAMODB_TABLE_NAME} deleted successfully")
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    logger.error(f"Error deleting table: {e}")
 
         # Create the table with the correct schema for Celery
         dynamodb_client.create_table(
@@ -165,7 +256,7 @@ def fix_dynamodb_table(force_recreate=False):
 
         # Wait for the table to be created
         waiter = dynamodb_client.get_waiter('table_exists')
-        waiter.wait(TableName=DYNAMODB_TABLE_NAME)
+        waiter.wait(TableName=DYNAMODB_TABLE_NAME, WaiterConfig=DYNAMODB_WAITER_CONFIG)
 
         # Enable TTL on the new table
         dynamodb_client.update_time_to_live(
@@ -184,9 +275,114 @@ def fix_dynamodb_table(force_recreate=False):
         return False
 
 
+def clear_dynamodb_table(max_items=1000):
+    """Delete every item in the DynamoDB table
 
-def test_opensearch_connection():
+    Small tables are emptied with parallel BatchWriteItem deletes, which is much
+    faster than waiting for a table to be deleted and recreated; tables with
+    max_items or more items are recreated instead.
+    """
+    try:
+        ensure_aws_clients()
+
+        # Scan only the key, stopping once the table is known to be large
+        items = []
+        scan_args = {'TableName': DYNAMODB_TABLE_NAME, 'ProjectionExpression': 'id', 'Limit': max_items}
+        while True:
+            response = dynamodb_client.scan(**scan_args)
+            items.extend(response.get('Items', []))
+            if len(items) >= max_items:
+                logger.info(f"Table {DYNAMODB_TABLE_NAME} has {max_items}+ items, recreating it")
+                return fix_dynamodb_table(force_recreate=True)
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_args['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        def delete_batch(keys):
+            # BatchWriteItem accepts at most 25 requests per call
+            request_items = {DYNAMODB_TABLE_NAME: [{'DeleteRequest': {'Key': key}} for key in keys]}
+            delay = 0.05
+            for _ in range(8):
+                response = dynamodb_client.batch_write_item(RequestItems=request_items)
+                request_items = response.get('UnprocessedItems')
+                if not request_items:
+                    return True
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+            return False
+
+        batches = [items[i:i + 25] for i in range(0, len(items), 25)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(len(batches), 10)) as executor:
+                results = list(executor.map(delete_batch, batches))
+            if not all(results):
+                logger.error(f"Some items in {DYNAMODB_TABLE_NAME} could not be deleted")
+                return False
+
+        logger.info(f"Deleted {len(items)} items from {DYNAMODB_TABLE_NAME}")
+        return True
+    except Exception as e:
+        logger.error(f"Error clearing DynamoDB table: {e}")
+        return False
+
+def _load_opensearch_auth_method():
+    """Seed the auth method cache from the file written by a previous probe"""
+    try:
+        with open(OPENSEARCH_AUTH_METHOD_FILE, "r") as f:
+            method = f.read().strip()
+        if method:
+            _opensearch_auth_cache['method'] = method
+            _opensearch_auth_cache['ts'] = os.path.getmtime(OPENSEARCH_AUTH_METHOD_FILE)
+    except (FileNotFoundError, IOError):
+        pass
+
+def _save_opensearch_auth_method(method):
+    """Remember a working auth method in memory and on disk"""
+    _opensearch_auth_cache['method'] = method
+    _opensearch_auth_cache['ts'] = time.time()
+    with open(OPENSEARCH_AUTH_METHOD_FILE, "w") as f:
+        f.write(method)
+
+def _get_opensearch_session():
+    """Return the shared HTTP session for OpenSearch requests"""
+    global _os_session
+    if _os_session is None:
+        import requests
+        _os_session = requests.Session()
+    return _os_session
+
+def _get_aws4auth():
+    """Return the shared AWS4Auth signer for OpenSearch"""
+    global _aws4auth
+    if _aws4auth is None:
+        from requests_aws4auth import AWS4Auth
+        _aws4auth = AWS4Auth(
+            AWS_ACCESS_KEY,
+            AWS_SECRET_KEY,
+            AWS_REGION,
+            'es'  # service name for OpenSearch
+        )
+    return _aws4auth
+
+def get_opensearch_auth():
+    """Return the auth for OpenSearch requests
+
+    Uses the method last confirmed by test_opensearch_connection (read from
+    OPENSEARCH_AUTH_METHOD_FILE at import): basic credentials, or otherwise the
+    shared AWS4Auth signer.
+    """
+    if _opensearch_auth_cache['method'] == 'basic':
+        from distributed_config import OPENSEARCH_USER, OPENSEARCH_PASS
+        return (OPENSEARCH_USER, OPENSEARCH_PASS)
+    return _get_aws4auth()
+
+def test_opensearch_connection(force=False):
     """Test and determine the best OpenSearch authentication method"""
+    # Reuse a recently confirmed method instead of probing the cluster again
+    if (not force and _opensearch_auth_cache['method'] and
+            time.time() - _opensearch_auth_cache['ts'] < OPENSEARCH_AUTH_CACHE_TTL):
+        return True, _opensearch_auth_cache['method']
+
     try:
         # Load OpenSearch details from environment
         from distributed_config import OPENSEARCH_ENDPOINT, OPENSEARCH_USER, OPENSEARCH_PASS
@@ -195,18 +391,12 @@ def test_opensearch_connection():
             logger.warning("OpenSearch endpoint not defined in environment")
             return False, None
 
-        # Try AWS4Auth first (best for AWS OpenSearch)
-        auth = AWS4Auth(
-            AWS_ACCESS_KEY,
-            AWS_SECRET_KEY,
-            AWS_REGION,
-            'es'  # service name for OpenSearch
-        )
+        session = _get_opensearch_session()
 
-        # Test connection with AWS4Auth
-        response = requests.get(
+        # Try AWS4Auth first (best for AWS OpenSearch)
+        response = session.get(
             f"{OPENSEARCH_ENDPOINT}/_cluster/health",
-            auth=auth,
+            auth=_get_aws4auth(),
             headers={"Content-Type": "application/json"},
             timeout=10,
             verify=True
@@ -217,15 +407,14 @@ def test_opensearch_connection():
             logger.info(f"Cluster health: {response.json()}")
 
             # Save auth method for future use
-            with open("opensearch_auth_method.txt", "w") as f:
-                f.write("aws4auth")
+            _save_opensearch_auth_method("aws4auth")
 
             return True, "aws4auth"
         else:
             logger.warning(f"AWS4Auth failed with status code {response.status_code}")
 
-        # Try basic auth
-        response = requests.get(
+        # Try basic auth (reuses the connection opened above)
+        response = session.get(
             f"{OPENSEARCH_ENDPOINT}/_cluster/health",
             auth=(OPENSEARCH_USER, OPENSEARCH_PASS),
             headers={"Content-Type": "application/json"},
@@ -238,8 +427,7 @@ def test_opensearch_connection():
             logger.info(f"Cluster health: {response.json()}")
 
             # Save auth method for future use
-            with open("opensearch_auth_method.txt", "w") as f:
-                f.write("basic")
+            _save_opensearch_auth_method("basic")
 
             return True, "basic"
         else:
@@ -252,6 +440,27 @@ def test_opensearch_connection():
         logger.error(f"Error testing OpenSearch connection: {e}")
         return False, None
 
+_load_opensearch_auth_method()
+
+def _create_queue(queue_name):
+    """Create an SQS queue if needed, apply its attributes and return its URL"""
+    queue = sqs_client.create_queue(QueueName=queue_name)
+    _queue_url_cache[queue_name] = queue['QueueUrl']
+
+    # Attributes are set separately so existing queues are updated too
+    # (create_queue fails if they differ from an existing queue's)
+    sqs_client.set_queue_attributes(
+        QueueUrl=queue['QueueUrl'],
+        Attributes={
+            'VisibilityTimeout': SQS_VISIBILITY_TIMEOUTS[queue_name],
+            'MessageRetentionPeriod': '86400',  # 1 day
+            # Long polling by default, so receives wait for messages instead of returning empty
+            'ReceiveMessageWaitTimeSeconds': SQS_WAIT_TIME_SECONDS
+        }
+    )
+    logger.info(f"Queue created/confirmed: {queue_name}")
+    return queue['QueueUrl']
+
 def setup_aws_resources():
     """Create necessary AWS resources if they don't exist"""
     if not init_aws_clients():
@@ -259,27 +468,10 @@ def setup_aws_resources():
 
     success = True
 
-    # Create SQS queues
+    # Create SQS queues (the events queue is created with its S3 notifications by 'fix')
     try:
-        # Create crawler queue
-        crawler_queue = sqs_client.create_queue(
-            QueueName=SQS_CRAWLER_QUEUE_NAME,
-            Attributes={
-                'VisibilityTimeout': '300',  # 5 minutes
-                'MessageRetentionPeriod': '86400'  # 1 day
-            }
-        )
-        logger.info(f"Crawler queue created/confirmed: {SQS_CRAWLER_QUEUE_NAME}")
-
-        # Create indexer queue
-        indexer_queue = sqs_client.create_queue(
-            QueueName=SQS_INDEXER_QUEUE_NAME,
-            Attributes={
-                'VisibilityTimeout': '300',
-                'MessageRetentionPeriod': '86400'
-            }
-        )
-        logger.info(f"Indexer queue created/confirmed: {SQS_INDEXER_QUEUE_NAME}")
+        for queue_name in (SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME):
+            _create_queue(queue_name)
 
     except ClientError as e:
         logger.error(f"Error setting up SQS queues: {e}")
@@ -332,21 +524,41 @@ def setup_aws_resources():
 
 def ensure_aws_clients():
     """Ensure AWS clients are initialized before using them"""
-    global sqs_client, dynamodb_client, s3_client
-    if sqs_client is None or dynamodb_client is None or s3_client is None:
-        return init_aws_clients()
-    return True
+    global _initialized
+    if _initialized:
+        return True
+    with _init_lock:
+        if not _initialized:
+            _initialized = init_aws_clients()
+    return _initialized
 
 def get_queue_url(queue_name):
     """Get the URL for a queue"""
+    if queue_name in _queue_url_cache:
+        return _queue_url_cache[queue_name]
     ensure_aws_clients()
     try:
         response = sqs_client.get_queue_url(QueueName=queue_name)
+        _queue_url_cache[queue_name] = response['QueueUrl']
         return response['QueueUrl']
     except ClientError as e:
         logger.error(f"Error getting queue URL for {queue_name}: {e}")
         return None
 
+def get_queue_depth(queue_name):
+    """Return the queued plus in-flight messages in a queue
+
+    Raises if the queue doesn't exist or the attributes can't be read.
+    """
+    queue_url = get_queue_url(queue_name)
+    # The shared client keeps its connections alive (BOTO_CONFIG), so both queues'
+    # calls on every poll reuse the same pooled connections
+    attrs = sqs_client.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
+    )['Attributes']
+    return int(attrs['ApproximateNumberOfMessages']) + int(attrs['ApproximateNumberOfMessagesNotVisible'])
+
 # Queue URL getters
 def get_crawler_queue_url():
     return get_queue_url(SQS_CRAWLER_QUEUE_NAME)
@@ -354,48 +566,232 @@ def get_crawler_queue_url():
 def get_indexer_queue_url():
     return get_queue_url(SQS_INDEXER_QUEUE_NAME)
 
+def iter_objects(prefix):
+    """Yield every object under a prefix in the bucket
+
+    A single list call stops at 1000 keys, so this goes through every listing
+    page, fetching the next one only as the objects are consumed.
+    """
+    ensure_aws_clients()
+    paginator = s3_client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=S3_BUCKET_NAME,
+        Prefix=prefix,
+        PaginationConfig={'PageSize': 1000}
+    )
+    for page in pages:
+        yield from page.get('Contents', [])
+
 # Create S3 directory structure
 def create_s3_directories():
     """Create S3 directory structure for input, output, and config"""
     ensure_aws_clients()
     try:
-        # Create input directory
-        s3_client.put_object(
-            Bucket=S3_BUCKET_NAME,
-            Key=S3_INPUT_PREFIX,
-            Body=''
+        # Create input, output and config directories in parallel
+        prefixes = [S3_INPUT_PREFIX, S3_OUTPUT_PREFIX, S3_CONFIG_PREFIX]
+        with ThreadPoolExecutor(max_workers=len(prefixes)) as executor:
+            list(executor.map(
+                lambda prefix: s3_client.put_object(Bucket=S3_BUCKET_NAME, Key=prefix, Body=b''),
+                prefixes
+            ))
+
+        logger.info(f"Created S3 directory structure in {S3_BUCKET_NAME}")
+        return True
+    except Exception as e:
+        logger.error(f"Error creating S3 directories: {e}")
+        return False
+
+def setup_s3_event_notifications():
+    """Send S3 ObjectCreated events under the output prefix to the events queue
+
+    Creates the events queue too. Other notifications on the bucket are kept;
+    only this queue's entry is added or replaced. Run from the CLI's fix
+    command, not at node startup.
+    """
+    ensure_aws_clients()
+    try:
+        queue_url = _create_queue(SQS_EVENTS_QUEUE_NAME)
+        queue_arn = sqs_client.get_queue_attributes(
+            QueueUrl=queue_url,
+            AttributeNames=['QueueArn']
+        )['Attributes']['QueueArn']
+
+        # S3 can only deliver to the queue if the queue policy allows it
+        policy = {
+            "Version": "2012-10-17",
+            "Statement": [{
+                "Effect": "Allow",
+                "Principal": {"Service": "s3.amazonaws.com"},
+                "Action": "sqs:SendMessage",
+                "Resource": queue_arn,
+                "Condition": {"ArnLike": {"aws:SourceArn": f"arn:aws:s3:::{S3_BUCKET_NAME}"}}
+            }]
+        }
+        sqs_client.set_queue_attributes(
+            QueueUrl=queue_url,
+            Attributes={'Policy': json.dumps(policy)}
         )
 
-        # Create output directory
-        s3_client.put_object(
+        # The put replaces the bucket's whole configuration, so start from the current one
+        notification_config = s3_client.get_bucket_notification_configuration(Bucket=S3_BUCKET_NAME)
+        notification_config.pop('ResponseMetadata', None)
+        queue_configs = [
+            config for config in notification_config.get('QueueConfigurations', [])
+            if config['QueueArn'] != queue_arn
+        ]
+        queue_configs.append({
+            'QueueArn': queue_arn,
+            'Events': ['s3:ObjectCreated:*'],
+            'Filter': {'Key': {'FilterRules': [
+                {'Name': 'prefix', 'Value': S3_OUTPUT_PREFIX}
+            ]}}
+        })
+        notification_config['QueueConfigurations'] = queue_configs
+
+        s3_client.put_bucket_notification_configuration(
             Bucket=S3_BUCKET_NAME,
-            Key=S3_OUTPUT_PREFIX,
-            Body=''
+            NotificationConfiguration=notification_config
         )
+        logger.info(f"S3 event notifications for {S3_OUTPUT_PREFIX} sent to {SQS_EVENTS_QUEUE_NAME}")
+        return True
+    except Exception as e:
+        logger.error(f"Error setting up S3 event notifications: {e}")
+        return False
 
-        # Create config directory
-        s3_client.put_object(
-            Bucket=S3_BUCKET_NAME,
-            Key=S3_CONFIG_PREFIX,
-            Body=''
+def s3_event_timestamp(seconds):
+    """Format a Unix time like the eventTime of S3 event records, so the two compare as strings"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds)) + f".{int(seconds % 1 * 1000):03d}Z"
+
+def page_event_records(message_body, since):
+    """Return the records of an events queue message for pages stored at or after since
+
+    Only ObjectCreated events for .json pages count; s3:TestEvent messages have
+    no records, and events from before since are left over from earlier crawls.
+    """
+    return [
+        record for record in _load_json(message_body).get('Records', [])
+        if record.get('eventName', '').startswith('ObjectCreated')
+        and record['s3']['object']['key'].endswith('.json')
+        and record.get('eventTime', '') >= since
+    ]
+
+def receive_page_events(queue_url, since, wait_time=SQS_WAIT_TIME_SECONDS):
+    """Long-poll the S3 events queue once for pages stored at or after since
+
+    Returns None if no message arrived within wait_time seconds, otherwise the
+    page records received (empty if the messages held none). Received messages
+    are deleted, so only one monitor should read the queue at a time.
+    """
+    ensure_aws_clients()
+    messages = sqs_client.receive_message(
+        QueueUrl=queue_url,
+        MaxNumberOfMessages=10,
+        WaitTimeSeconds=int(wait_time)
+    ).get('Messages', [])
+    if not messages:
+        return None
+
+    sqs_client.delete_message_batch(
+        QueueUrl=queue_url,
+        Entries=[
+            {'Id': str(i), 'ReceiptHandle': message['ReceiptHandle']}
+            for i, message in enumerate(messages)
+        ]
+    )
+    return [record for message in messages for record in page_event_records(message['Body'], since)]
+
+def increment_content_count():
+    """Count one stored page; flush_content_count adds the pages to the counter item
+
+    Pages are added in one update every CONTENT_COUNT_FLUSH_INTERVAL seconds,
+    rather than one write per page on the crawl path.
+    """
+    global _pending_content_count, _content_count_flusher_pid
+    with _content_count_lock:
+        _pending_content_count += 1
+        # Threads don't survive fork, so each worker process starts its own flusher
+        if _content_count_flusher_pid != os.getpid():
+            _content_count_flusher_pid = os.getpid()
+            threading.Thread(target=_flush_content_count_loop, daemon=True).start()
+
+def _flush_content_count_loop():
+    """Flush the pending page count periodically"""
+    while True:
+        time.sleep(CONTENT_COUNT_FLUSH_INTERVAL)
+        flush_content_count()
+
+def flush_content_count():
+    """Atomically add the pages counted in this process to the stored-pages counter item"""
+    global _pending_content_count
+    with _content_count_lock:
+        count, _pending_content_count = _pending_content_count, 0
+    if not count:
+        return True
+    ensure_aws_clients()
+    try:
+        dynamodb_client.update_item(
+            TableName=DYNAMODB_TABLE_NAME,
+            Key={'id': {'S': DYNAMODB_CONTENT_COUNTER_ID}},
+            UpdateExpression='ADD cnt :count',
+            ExpressionAttributeValues={':count': {'N': str(count)}}
         )
+        return True
+    except Exception as e:
+        # Keep the pages for the next flush so the counter doesn't drift
+        with _content_count_lock:
+            _pending_content_count += count
+        logger.error(f"Error updating content counter: {e}")
+        return False
 
-        logger.info(f"Created S3 directory structure in {S3_BUCKET_NAME}")
+def reset_content_count():
+    """Set the stored-pages counter item to the number of pages in S3
+
+    Counts pages stored before the counter existed; pages saved while the
+    listing runs may be missed or counted twice.
+    """
+    ensure_aws_clients()
+    try:
+        count = sum(1 for item in iter_objects(S3_OUTPUT_PREFIX) if item['Key'].endswith('.json'))
+        dynamodb_client.put_item(
+            TableName=DYNAMODB_TABLE_NAME,
+            Item={'id': {'S': DYNAMODB_CONTENT_COUNTER_ID}, 'cnt': {'N': str(count)}}
+        )
+        logger.info(f"Content counter set to {count} pages")
         return True
     except Exception as e:
-        logger.error(f"Error creating S3 directories: {e}")
+        logger.error(f"Error resetting content counter: {e}")
         return False
 
+def get_content_count():
+    """Return the stored-pages counter, or None if the counter item doesn't exist"""
+    ensure_aws_clients()
+    try:
+        response = dynamodb_client.get_item(
+            TableName=DYNAMODB_TABLE_NAME,
+            Key={'id': {'S': DYNAMODB_CONTENT_COUNTER_ID}},
+            ProjectionExpression='cnt'
+        )
+        if 'Item' not in response:
+            return None
+        return int(response['Item']['cnt']['N'])
+    except Exception as e:
+        logger.error(f"Error reading content counter: {e}")
+        return None
+
 # Helper function to store configuration in S3
-def store_config_in_s3(config):
+def _config_key(config_id=None):
+    """S3 key of the shared configuration, or of a crawl's configuration by ID"""
+    return f"{S3_CONFIG_PREFIX}{config_id or 'crawler_config'}.json"
+
+def store_config_in_s3(config, config_id=None):
     """Store crawler configuration in S3"""
     ensure_aws_clients()
     try:
-        key = f"{S3_CONFIG_PREFIX}crawler_config.json"
+        key = _config_key(config_id)
         s3_client.put_object(
             Bucket=S3_BUCKET_NAME,
             Key=key,
-            Body=json.dumps(config, indent=2).encode(),
+            Body=_dump_json(config, indent=True),
             ContentType='application/json'
         )
         logger.info(f"Configuration saved to S3: s3://{S3_BUCKET_NAME}/{key}")
@@ -405,16 +801,16 @@ def store_config_in_s3(config):
         return False
 
 # Helper function to retrieve configuration from S3
-def get_config_from_s3():
+def get_config_from_s3(config_id=None):
     """Retrieve crawler configuration from S3"""
     ensure_aws_clients()
     try:
-        key = f"{S3_CONFIG_PREFIX}crawler_config.json"
+        key = _config_key(config_id)
         response = s3_client.get_object(
             Bucket=S3_BUCKET_NAME,
             Key=key
         )
-        config = json.loads(response['Body'].read().decode())
+        config = _load_json(response['Body'].read())
         logger.info(f"Configuration retrieved from S3: s3://{S3_BUCKET_NAME}/{key}")
         return config
     except ClientError as e:
@@ -1,99 +1,252 @@
 #!/usr/bin/env python3
 # filepath:celery_app.py
 
-import os
+import base64
 import logging
-from celery import Celery
-from urllib.parse import quote
-import boto3
-from botocore.exceptions import NoCredentialsError, ClientError
-import time
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-try:
-    # Try to get AWS credentials directly from environment variables
-    from aws_config import AWS_ACCESS_KEY, AWS_SECRET_KEY, AWS_REGION, DYNAMODB_TABLE_NAME, SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME
+from uuid import uuid4
+from celery import Celery, group
+from kombu import serialization
+from kombu.utils.json import dumps as kombu_dumps, loads as kombu_loads
+from kombu.utils.encoding import bytes_to_str, str_to_bytes
 
-    # Set up SQS broker URL (using environment variables)
-    broker_url = f"sqs://{AWS_ACCESS_KEY}:{quote(AWS_SECRET_KEY)}@"
+logger = logging.getLogger(__name__)
 
-    # Create the Celery app with SQS broker
-    app = Celery('webcrawler', broker=broker_url)
+# SQS accepts at most 10 messages per SendMessageBatch call
+SQS_BATCH_SIZE = 10
 
-    # Configure the app with AWS settings
-    app.conf.update(
-        # Basic celery settings
-        task_serializer='json',
-        accept_content=['json'],
-        result_serializer='json',
-        timezone='UTC',
-        enable_utc=True,
-        worker_prefetch_multiplier=1,
-        task_acks_late=True,
-        task_track_started=True,
-
-        # Set result backend for simplicity
-        result_backend=None,
-        task_ignore_result=True,
+# Whether workers can decode the SQS messages send_tasks_batch builds, checked once per process
+_sqs_envelope_ok = None
 
-        worker_send_Task_events=False,
-        worker_enable_remote_control=False,
-        task_send_sent_event=False,
-
-        # SQS broker configuration
-        broker_transport_options={
-            'region': AWS_REGION,
-            'polling_interval': 5,  # Seconds between polling SQS
-            'wait_time_seconds': 20,  # Max time for long polling
-            'visibility_timeout': 300,  # 5 minutes visibility timeout
-            'predefined_queues': {
-                'crawler': {
-                    'url': f"https://sqs.{AWS_REGION}.amazonaws.com/{SQS_CRAWLER_QUEUE_NAME}",
-                    'access_key_id': AWS_ACCESS_KEY,
-                    'secret_access_key': AWS_SECRET_KEY,
-                },
-                'indexer': {
-                    'url': f"https://sqs.{AWS_REGION}.amazonaws.com/{SQS_INDEXER_QUEUE_NAME}",
-                    'access_key_id': AWS_ACCESS_KEY,
-                    'secret_access_key': AWS_SECRET_KEY,
-                },
-            }
-        },
+# Serialize task messages with orjson when it's installed; plain JSON is
+# still accepted so messages queued before the switch keep working
+try:
+    import orjson
 
-        # Route tasks to appropriate queues
-        task_routes={
-            'tasks.crawl': {'queue': 'crawler'},
-            'tasks.index': {'queue': 'indexer'},
-        }
+    serialization.register(
+        'orjson',
+        lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads,
+        content_type='application/x-orjson',
+        content_encoding='utf-8'
     )
+    TASK_SERIALIZER = 'orjson'
+except ImportError:
+    TASK_SERIALIZER = 'json'
 
-    logger.info("Celery app initialized with SQS broker")
-    logger.info(f"Using {SQS_CRAWLER_QUEUE_NAME} for crawler tasks")
-    logger.info(f"Using {SQS_INDEXER_QUEUE_NAME} for indexer tasks")
-
-except ImportError as e:
-    logger.error(f"Failed to import AWS configuration: {e}")
-    # Fallback to local Redis for development
-    app = Celery('webcrawler', broker='redis://localhost:6379/0',
-                 backend='redis://localhost:6379/0')
-    logger.warning("Using local Redis backend (development mode)")
-
-except NoCredentialsError:
-    logger.error("AWS credentials not found")
-    app = Celery('webcrawler', broker='redis://localhost:6379/0',
-                 backend='redis://localhost:6379/0')
-    logger.warning("Using local Redis backend (AWS credentials missing)")
-
-except Exception as e:
-    logger.error(f"Failed to initialize AWS configuration: {e}")
-    # Use memory backend instead of Redis as fallback
+def _create_local_app(reason):
+    """Create an in-memory Celery app for when the SQS broker can't be used"""
     app = Celery('webcrawler')
     app.conf.update(
         broker_url='memory://',
         result_backend='rpc://',
         task_ignore_result=True,
     )
-    logger.warning(f"Using memory backend due to error: {e}")
\ No newline at end of file
+    logger.warning(f"Using memory backend ({reason})")
+    return app
+
+def create_celery_app():
+    """Create the Celery app: SQS broker when AWS is configured, local fallbacks otherwise"""
+    try:
+        # Try to get AWS credentials directly from environment variables
+        from aws_config import (
+            AWS_ACCESS_KEY, AWS_SECRET_KEY, AWS_REGION,
+            SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME, CELERY_BROKER_URL
+        )
+    except ImportError as e:
+        logger.error(f"Failed to import AWS configuration: {e}")
+        return _create_local_app("development mode")
+
+    if not AWS_ACCESS_KEY or not AWS_SECRET_KEY:
+        logger.error("AWS credentials not found")
+        return _create_local_app("AWS credentials missing")
+
+    try:
+        # Create the Celery app with SQS broker
+        app = Celery('webcrawler', broker=CELERY_BROKER_URL)
+
+        # Configure the app with AWS settings
+        app.conf.update(
+            # Basic celery settings
+            task_serializer=TASK_SERIALIZER,
+            accept_content=[TASK_SERIALIZER, 'json'],
+            result_serializer=TASK_SERIALIZER,
+            timezone='UTC',
+            enable_utc=True,
+            # The prefetch multiplier is set per worker type with --prefetch-multiplier
+            # (run_crawler.py, run_indexer.py), not here
+            task_acks_late=True,
+            task_track_started=True,
+
+            # No result backend: crawl and index tasks are fire-and-forget (progress
+            # is tracked through S3) and nothing reads task results. A task that needs
+            # them would set ignore_result=False and result_backend to
+            # "aws_dynamodb_backend:CeleryDynamoBackend+dynamodb://@<region>/<table>".
+            result_backend=None,
+            task_ignore_result=True,
+
+            # Keep retrying the broker connection at startup (with kombu's growing
+            # interval) instead of exiting when SQS throttles a rolling restart
+            broker_connection_retry_on_startup=True,
+            broker_connection_max_retries=None,
+            broker_connection_timeout=10,
+            broker_pool_limit=10,
+
+            # No event or remote-control traffic over SQS
+            worker_send_task_events=False,
+            worker_enable_remote_control=False,
+            task_send_sent_event=False,
+
+            # SQS broker configuration (visibility timeouts are set per queue
+            # in aws_config, since kombu doesn't manage predefined queues)
+            broker_transport_options={
+                'region': AWS_REGION,
+                'polling_interval': 0,  # Long polling already waits, no sleep between polls
+                'wait_time_seconds': 20,  # Max time for long polling
+                # botocore Config for kombu's SQS clients: keep connections alive
+                # between long polls (read_timeout must exceed wait_time_seconds)
+                'client-config': {
+                    'tcp_keepalive': True,
+                    'max_pool_connections': 50,
+                    'connect_timeout': 3,
+                    'read_timeout': 30,
+                    'retries': {'max_attempts': 10, 'mode': 'adaptive'},
+                },
+                'predefined_queues': {
+                    'crawler': {
+                        'url': f"https://sqs.{AWS_REGION}.amazonaws.com/{SQS_CRAWLER_QUEUE_NAME}",
+                        'access_key_id': AWS_ACCESS_KEY,
+                        'secret_access_key': AWS_SECRET_KEY,
+                    },
+                    'indexer': {
+                        'url': f"https://sqs.{AWS_REGION}.amazonaws.com/{SQS_INDEXER_QUEUE_NAME}",
+                        'access_key_id': AWS_ACCESS_KEY,
+                        'secret_access_key': AWS_SECRET_KEY,
+                    },
+                }
+            },
+
+            # Route tasks to appropriate queues
+            task_routes={
+                'tasks.crawl': {'queue': 'crawler'},
+                'tasks.index': {'queue': 'indexer'},
+            }
+        )
+
+        logger.info("Celery app initialized with SQS broker")
+        logger.info(f"Using {SQS_CRAWLER_QUEUE_NAME} for crawler tasks")
+        logger.info(f"Using {SQS_INDEXER_QUEUE_NAME} for indexer tasks")
+
+    except Exception as e:
+        logger.error(f"Failed to initialize AWS configuration: {e}")
+        app = _create_local_app(f"error: {e}")
+
+    return app
+
+app = create_celery_app()
+
+def load_tasks():
+    """Import task modules so they register with the app (worker entry points only)"""
+    import tasks
+    return tasks
+
+def _sqs_message_body(task, task_id, args, queue, **options):
+    """Encode a task call the way kombu's SQS transport does, so workers consume it as usual
+
+    This skips Celery's publish path: no before_task_publish/after_task_publish
+    signals, no task_routes beyond the queue given, and no compression. The
+    envelope follows kombu 5.5's SQS wire format, which _sqs_envelope_works checks.
+    """
+    headers, properties, body, _ = app.amqp.as_task_v2(
+        task_id, task.name, args=args, kwargs={}, ignore_result=task.ignore_result, **options
+    )
+    content_type, content_encoding, payload = serialization.dumps(body, serializer=task.serializer)
+    properties.update(
+        delivery_mode=2,
+        priority=0,
+        body_encoding='base64',
+        delivery_tag=str(uuid4()),
+        delivery_info={'exchange': queue, 'routing_key': queue},
+    )
+    message = {
+        'body': base64.b64encode(str_to_bytes(payload)).decode('ascii'),
+        'content-encoding': content_encoding,
+        'content-type': content_type,
+        'headers': headers,
+        'properties': properties,
+    }
+    return base64.b64encode(kombu_dumps(message).encode('utf-8')).decode('ascii')
+
+def _sqs_envelope_works(task, args):
+    """Check that a message from _sqs_message_body decodes the way a worker reads it
+
+    Runs once per process, through kombu's own SQS and message decoding, so a
+    change to kombu's wire format sends tasks through Celery instead of
+    queueing messages workers can't read.
+    """
+    global _sqs_envelope_ok
+    if _sqs_envelope_ok is None:
+        try:
+            from kombu import Connection
+            from kombu.transport.SQS import Channel
+            from kombu.transport.virtual import Message
+
+            task_id = str(uuid4())
+            raw = Channel._optional_b64_decode(_sqs_message_body(task, task_id, args, 'check').encode())
+            payload = kombu_loads(bytes_to_str(raw))
+            payload['properties']['delivery_tag'] = task_id
+            with Connection('memory://') as connection:
+                message = Message(payload, channel=connection.default_channel)
+                decoded_args = message.decode()[0]
+            _sqs_envelope_ok = (
+                message.headers['task'] == task.name
+                and message.headers['id'] == task_id
+                and list(decoded_args) == list(args)
+            )
+        except Exception as e:
+            logger.error(f"Error checking the SQS message format: {e}")
+            _sqs_envelope_ok = False
+        if not _sqs_envelope_ok:
+            logger.error("Batched SQS messages wouldn't decode on workers, sending tasks through Celery")
+    return _sqs_envelope_ok
+
+def send_tasks_batch(task, args_list, **options):
+    """Queue many calls of a task with SQS SendMessageBatch, 10 messages per request
+
+    Falls back to a Celery group when the broker isn't SQS, or when the
+    message format check fails. Extra options
+    (e.g. parent_id, root_id) are passed to the task message. Returns the task IDs.
+    """
+    args_list = [tuple(args) for args in args_list]
+    if not args_list:
+        return []
+
+    queue = app.conf.task_routes.get(task.name, {}).get('queue')
+    if (not queue or not str(app.conf.broker_url).startswith('sqs://')
+            or not _sqs_envelope_works(task, args_list[0])):
+        result = group(task.s(*args).set(**options) for args in args_list).apply_async()
+        return [r.id for r in result.results]
+
+    from aws_config import get_queue_url, SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME
+    queue_url = get_queue_url({'crawler': SQS_CRAWLER_QUEUE_NAME, 'indexer': SQS_INDEXER_QUEUE_NAME}[queue])
+    from aws_config import sqs_client
+
+    calls = [(str(uuid4()), args) for args in args_list]
+    for start in range(0, len(calls), SQS_BATCH_SIZE):
+        batch = calls[start:start + SQS_BATCH_SIZE]
+        failed = batch
+        if queue_url:
+            entries = [
+                {'Id': str(i), 'MessageBody': _sqs_message_body(task, task_id, args, queue, **options)}
+                for i, (task_id, args) in enumerate(batch)
+            ]
+            try:
+                response = sqs_client.send_message_batch(QueueUrl=queue_url, Entries=entries)
+                failed = [batch[int(entry['Id'])] for entry in response.get('Failed', [])]
+            except Exception as e:
+                logger.error(f"Error sending task batch to {queue}: {e}")
+
+        # Send anything SQS didn't accept through the regular Celery path
+        for task_id, args in failed:
+            task.apply_async(args, task_id=task_id, **options)
+
+    return [task_id for task_id, _ in calls]
@@ -1,14 +1,27 @@
 import logging
 import os
+import json
+import hashlib
 from tasks import crawl
+from celery_app import send_tasks_batch
 from crawler_config import CrawlerConfig
+from aws_config import store_config_in_s3
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+def publish_config(config):
+    """Store a crawl configuration in S3 and return the ID tasks load it by
+
+    Falls back to returning the configuration itself, which tasks also accept,
+    if it can't be stored.
+    """
+    config_json = json.dumps(config, sort_keys=True, separators=(',', ':'))
+    config_id = hashlib.sha1(config_json.encode('utf-8')).hexdigest()[:16]
+    if store_config_in_s3(config, config_id):
+        return config_id
+    logger.warning("Could not store configuration in S3, sending it with each task")
+    return config
+
 def start_crawl(config_file='crawler_config.json'):
     """Start the crawling process by submitting initial tasks"""
     # Load configuration
@@ -18,19 +31,32 @@ def start_crawl(config_file='crawler_config.json'):
     # Create output directory
     os.makedirs(config['output_dir'], exist_ok=True)
 
-    logger.info("Starting crawl with configuration:")
-    logger.info(f"  Seed URLs: {config['seed_urls']}")
-    logger.info(f"  Max Depth: {config['max_depth']}")
-    logger.info(f"  Restricted Domains: {config['restricted_domains']}")
+    # Store the configuration once and send only its ID with each task
+    task_config = publish_config(config)
+
+    # Seed lists can be long, so only a summary is logged at INFO (the f-strings
+    # below are only built when DEBUG logging is on)
+    seed_urls = config['seed_urls']
+    config_label = task_config if isinstance(task_config, str) else 'inline'
+    logger.info(f"Starting crawl of {len(seed_urls)} seed URLs "
+                f"(max depth {config['max_depth']}, config {config_label})")
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug(f"  Seed URLs: {seed_urls}")
+        logger.debug(f"  Restricted Domains: {config['restricted_domains']}")
 
-    # Submit initial crawl tasks for seed URLs
-    task_ids = []
-    for url in config['seed_urls']:
-        task = crawl.delay(url, 0, config)
-        task_ids.append(task.id)
-        logger.info(f"Submitted seed URL: {url}, task ID: {task.id}")
+    # Submit initial crawl tasks for seed URLs in SQS batches of 10
+    task_ids = send_tasks_batch(crawl, [(url, 0, task_config) for url in seed_urls])
+    if debug:
+        for url, task_id in zip(seed_urls, task_ids):
+            logger.debug(f"Submitted seed URL: {url}, task ID: {task_id}")
+    logger.info(f"Submitted {len(task_ids)} seed URLs")
 
     return task_ids
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     start_crawl()
\ No newline at end of file
@@ -2,95 +2,171 @@
 # filepath: crawler_cli.py
 
 import argparse
+import hashlib
+import heapq
+import itertools
 import json
+import logging
 import os
+import signal
 import sys
+import textwrap
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import aws_config
 from crawler_config import CrawlerConfig
-from coordinator import start_crawl
-from celery.result import AsyncResult
-from celery_app import app as celery_app
-from search import search_content
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Minimum seconds between monitor status line updates
+STATUS_PRINT_INTERVAL = 10
+
+# HTTP session reused across node and OpenSearch requests
+_http_session = None
+
+# S3 client, looked up once per process
+_s3 = None
+
+def _get_s3():
+    """Return the shared S3 client, creating the AWS clients on first use"""
+    global _s3
+    if _s3 is None:
+        aws_config.ensure_aws_clients()
+        _s3 = aws_config.s3_client
+    return _s3
+
+# Config manager loaded by this invocation, and a digest of the config as last
+# loaded or saved, so unchanged configs aren't written back to S3
+_config_manager = None
+_saved_config_digest = None
+
+def _config_digest(config):
+    """Return a digest of the config contents"""
+    return hashlib.blake2b(json.dumps(config, sort_keys=True).encode()).digest()
 
 def load_config():
     """Load configuration from config file and S3"""
-    config_manager = CrawlerConfig()
-    return config_manager.get_config()
+    global _config_manager, _saved_config_digest
+    _config_manager = CrawlerConfig()
+    config = _config_manager.get_config()
+    _saved_config_digest = _config_digest(config)
+    return config
 
 def save_config(config):
-    """Save configuration to config file and S3"""
-    config_manager = CrawlerConfig()
-    config_manager.config = config
-    config_manager.save_config()
+    """Save configuration to config file and S3, unless it is unchanged"""
+    global _config_manager, _saved_config_digest
+    digest = _config_digest(config)
+    if digest == _saved_config_digest:
+        return
+    # Reuse the loaded manager rather than fetching the config from S3 again
+    if _config_manager is None:
+        _config_manager = CrawlerConfig()
+    _config_manager.config = config
+    _config_manager.save_config()
+    _saved_config_digest = digest
     print("Configuration saved successfully")
 
 def print_config(config):
     """Print current configuration"""
-    print("\nCurrent Configuration:")
-    print("-" * 50)
-    print(f"Seed URLs: {', '.join(config['seed_urls'])}")
-    print(f"Restricted Domains: {', '.join(config['restricted_domains'])}")
-    print(f"Max Depth: {config['max_depth']}")
-    print(f"Number of Crawlers: {config['num_crawlers']}")
-    print(f"Number of Indexers: {config['num_indexers']}")
-    print(f"Request Delay: {config['request_delay']} seconds")
-    print(f"Timeout: {config['timeout']} seconds")
-    print(f"Output Directory: {config['output_dir']}")
-    print(f"Elasticsearch URL: {config.get('elasticsearch_url', 'http://localhost:9200')}")
-    print(f"Elasticsearch Index: {config.get('elasticsearch_index', 'webcrawler')}")
-    print("-" * 50)
-
-def monitor_tasks(task_ids, max_runtime=1200, status_interval=5):
-    """Monitor task progress and shutdown nodes when crawling is complete"""
+    # Written as one block rather than a print call per line
+    lines = [
+        "",
+        "Current Configuration:",
+        "-" * 50,
+        f"Seed URLs: {', '.join(config['seed_urls'])}",
+        f"Restricted Domains: {', '.join(config['restricted_domains'])}",
+        f"Max Depth: {config['max_depth']}",
+        f"Number of Crawlers: {config['num_crawlers']}",
+        f"Number of Indexers: {config['num_indexers']}",
+        f"Request Delay: {config['request_delay']} seconds",
+        f"Timeout: {config['timeout']} seconds",
+        f"Output Directory: {config['output_dir']}",
+        f"Elasticsearch URL: {config.get('elasticsearch_url', 'http://localhost:9200')}",
+        f"Elasticsearch Index: {config.get('elasticsearch_index', 'webcrawler')}",
+        "-" * 50,
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+def monitor_tasks(task_ids, max_runtime=1200, status_interval=5, idle_timeout=120, started_at=None):
+    """Monitor task progress and shutdown nodes when crawling is complete
+
+    Progress comes from the S3 ObjectCreated events delivered to the events
+    queue. The crawl is complete once both task queues are empty on two
+    consecutive checks, or no content has arrived for idle_timeout seconds.
+    Without the events queue it falls back to polling the queue depths.
+
+    started_at is the Unix time the crawl was submitted (default: now); events
+    from before it are left over from earlier crawls and are discarded.
+    Events are deleted once counted (see aws_config.receive_page_events), so
+    don't run this alongside the crawler_client monitor.
+    """
     print(f"\nMonitoring {len(task_ids)} crawler tasks...")
 
     try:
-        from aws_config import S3_BUCKET_NAME, S3_OUTPUT_PREFIX, ensure_aws_clients
-        ensure_aws_clients()
-        from aws_config import s3_client
+        queue_url = aws_config.get_queue_url(aws_config.SQS_EVENTS_QUEUE_NAME)
+        if not queue_url:
+            print("S3 events queue not found (run 'fix' to create it), polling queue depths instead")
+            _monitor_by_polling(max_runtime, status_interval)
+            return
 
-        # Get initial count
-        initial_count = count_s3_objects(S3_OUTPUT_PREFIX)
-        print(f"Initial content count in S3: {initial_count}")
+        # Old events are filtered by time rather than purged: a purge takes up to
+        # 60 seconds and can also delete the first events of this crawl
+        crawl_start = aws_config.s3_event_timestamp(time.time() if started_at is None else started_at)
 
-        # Track when count stabilizes
-        stable_count = initial_count
-        stable_since = time.time()
-        no_change_duration = 0
+        processed_count = 0
+        events_seen = False
+        drained_polls = 0
 
-        # Monitor progress with overall timeout
-        start_time = time.time()
+        # Monotonic clock, so wall-clock adjustments can't end monitoring early
+        start_time = time.monotonic()
+        deadline = start_time + max_runtime
+        last_event_time = start_time
+        last_print = start_time - STATUS_PRINT_INTERVAL
 
         while True:
+            # Long poll: returns as soon as events arrive, or after the wait time
+            records = aws_config.receive_page_events(queue_url, crawl_start)
+
+            now = time.monotonic()
+
+            if records is not None:
+                processed_count += len(records)
+                if records:
+                    events_seen = True
+                    last_event_time = now
+                drained_polls = 0
+            else:
+                # A quiet long poll: check whether any tasks are still queued or in flight
+                pending = check_queue_status().get('total_pending')
+                drained_polls = drained_polls + 1 if pending == 0 else 0
+
+            idle_duration = now - last_event_time
+            if now - last_print >= STATUS_PRINT_INTERVAL:
+                last_print = now
+                print(f"\r[+{int(now - start_time)}s] Processing... pages stored: {processed_count} "
+                      f"(no new content for {int(idle_duration)}s)", end="", flush=True)
+
             # Check timeouts
-            elapsed_time = time.time() - start_time
-            if elapsed_time > max_runtime:
+            if now > deadline:
                 print("\nMaximum runtime exceeded. Initiating shutdown sequence.")
                 trigger_shutdown()
                 break
 
-            # Sleep before checking again
-            time.sleep(status_interval)
-
-            # Check S3 for new content
-            current_count = count_s3_objects(S3_OUTPUT_PREFIX)
-            new_items = current_count - initial_count
-
-            # If count changed, reset the stability timer
-            if current_count != stable_count:
-                stable_count = current_count
-                stable_since = time.time()
-                no_change_duration = 0
-            else:
-                no_change_duration = time.time() - stable_since
-
-            print(f"\r[{time.strftime('%H:%M:%S')}] Processing... S3 objects: {current_count} " +
-                  f"(+{new_items} since start, stable for {int(no_change_duration)}s)", end="", flush=True)
+            # Queue depths are approximate, so require two empty readings in a row
+            if events_seen and drained_polls >= 2:
+                print("\nTask queues are empty. Crawling complete. Initiating shutdown sequence.")
+                trigger_shutdown()
+                break
 
-            # If no new items for 1 minute and some processing has occurred, assume completion
-            if no_change_duration > 60 and current_count > initial_count:
-                print("\nNo new content for 2 minutes. Crawling complete. Initiating shutdown sequence.")
+            # If no new content for idle_timeout after some processing, assume completion.
+            # New objects are known from their events, so this needs no S3 listing call.
+            if events_seen and idle_duration > idle_timeout:
+                print(f"\nNo new content for {idle_timeout} seconds. Crawling complete. Initiating shutdown sequence.")
                 trigger_shutdown()
                 break
 
@@ -99,17 +175,89 @@ def monitor_tasks(task_ids, max_runtime=1200, status_interval=5):
     except Exception as e:
         print(f"\nError in monitoring: {e}")
 
+def stop_event_on_sigint():
+    """Return an Event that Ctrl-C sets, and the SIGINT handler to restore afterwards
+
+    Waiting on the event instead of sleeping lets Ctrl-C end a wait immediately.
+    Signal handlers can only be installed from the main thread.
+    """
+    stop_event = threading.Event()
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread():
+        previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+    return stop_event, previous_handler
+
+def _monitor_by_polling(max_runtime, status_interval):
+    """Detect crawl completion by polling the task queue depths
+
+    Empty queues only count once the crawl has been seen working: a non-zero
+    reading, or pages stored since monitoring started.
+    """
+    drained_polls = 0
+    last_pending = None
+    work_seen = False
+    initial_count = aws_config.get_content_count()
+
+    # Monitor progress with overall timeout
+    start_time = time.monotonic()
+    deadline = start_time + max_runtime
+    last_print = start_time - STATUS_PRINT_INTERVAL
+
+    # Poll less often while nothing changes, up to once a minute
+    interval = status_interval
+    stop_event, previous_handler = stop_event_on_sigint()
+
+    try:
+        while True:
+            # Wait before checking again (receiving from the task queues would take their messages)
+            if stop_event.wait(interval):
+                print("\nMonitoring stopped by user.")
+                break
+
+            # Queued plus in-flight tasks, from the SQS queue attributes
+            pending = check_queue_status().get('total_pending')
+            if pending:
+                work_seen = True
+            elif pending == 0 and not work_seen:
+                # Queue depths lag, so empty queues before any work may just not show it yet
+                count = aws_config.get_content_count()
+                work_seen = count is not None and count != initial_count
+            drained_polls = drained_polls + 1 if pending == 0 and work_seen else 0
+            interval = status_interval if pending != last_pending else min(interval * 1.5, 60)
+            last_pending = pending
+
+            now = time.monotonic()
+            if now - last_print >= STATUS_PRINT_INTERVAL:
+                last_print = now
+                print(f"\r[+{int(now - start_time)}s] Processing... pending tasks: {pending}",
+                      end="", flush=True)
+
+            # Check timeouts
+            if now > deadline:
+                print("\nMaximum runtime exceeded. Initiating shutdown sequence.")
+                trigger_shutdown()
+                break
+
+            # Queue depths are approximate, so require two empty readings in a row
+            if drained_polls >= 2:
+                print("\nTask queues are empty. Crawling complete. Initiating shutdown sequence.")
+                trigger_shutdown()
+                break
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+
 def trigger_shutdown():
     """Send shutdown signals to crawler and indexer nodes"""
     from distributed_config import CRAWLER_IP, INDEXER_IP
-    import requests
+    session = _get_http_session()
 
     print("\n==== Initiating Graceful Shutdown Sequence ====")
 
     # Step 1: Shutdown crawler nodes
     try:
         print("Sending shutdown signal to crawler node...")
-        resp = requests.post(f"http://{CRAWLER_IP}:8080/shutdown", timeout=3)
+        resp = session.post(f"http://{CRAWLER_IP}:8080/shutdown", timeout=3)
         print(f"Crawler node shutdown response: {resp.status_code}")
     except Exception as e:
         print(f"Error shutting down crawler node: {e}")
@@ -121,45 +269,27 @@ def trigger_shutdown():
     # Step 2: Shutdown indexer nodes
     try:
         print("Sending shutdown signal to indexer node...")
-        resp = requests.post(f"http://{INDEXER_IP}:8080/shutdown", timeout=3)
+        resp = session.post(f"http://{INDEXER_IP}:8080/shutdown", timeout=3)
         print(f"Indexer node shutdown response: {resp.status_code}")
     except Exception as e:
         print(f"Error shutting down indexer node: {e}")
 
     # Step 3: Shutdown master
     print("Shutting down master node...")
-    time.sleep(3)  # Give time to print messages
+    sys.stdout.flush()  # os._exit skips flushing buffered output
     os._exit(0)  # Exit without waiting for threads
 
 
 def check_queue_status():
     """Check if there are any pending tasks in the queues"""
     try:
-        from aws_config import sqs_client, SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME
-
-        # Get queue URLs
-        crawler_queue_url = sqs_client.get_queue_url(QueueName=SQS_CRAWLER_QUEUE_NAME)['QueueUrl']
-        indexer_queue_url = sqs_client.get_queue_url(QueueName=SQS_INDEXER_QUEUE_NAME)['QueueUrl']
-
-        # Get approximate number of messages
-        crawler_attrs = sqs_client.get_queue_attributes(
-            QueueUrl=crawler_queue_url,
-            AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
-        )
-        indexer_attrs = sqs_client.get_queue_attributes(
-            QueueUrl=indexer_queue_url,
-            AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
-        )
-
-        # Count total messages (both visible and in flight)
-        crawler_messages = (
-            int(crawler_attrs['Attributes']['ApproximateNumberOfMessages']) +
-            int(crawler_attrs['Attributes']['ApproximateNumberOfMessagesNotVisible'])
-        )
-        indexer_messages = (
-            int(indexer_attrs['Attributes']['ApproximateNumberOfMessages']) +
-            int(indexer_attrs['Attributes']['ApproximateNumberOfMessagesNotVisible'])
-        )
+        # Get the number of messages (both visible and in flight) for both queues
+        # concurrently; queue URLs are cached per process by aws_config.get_queue_url
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            crawler_future = executor.submit(aws_config.get_queue_depth, aws_config.SQS_CRAWLER_QUEUE_NAME)
+            indexer_future = executor.submit(aws_config.get_queue_depth, aws_config.SQS_INDEXER_QUEUE_NAME)
+            crawler_messages = crawler_future.result()
+            indexer_messages = indexer_future.result()
 
         return {
             "crawler_queue": crawler_messages,
@@ -173,9 +303,7 @@ def check_queue_status():
 
 def mark_crawl_as_complete(task_ids):
     """Mark that a crawl session is complete in S3"""
-    from aws_config import S3_BUCKET_NAME, ensure_aws_clients
-    ensure_aws_clients()
-    from aws_config import s3_client
+    s3_client = _get_s3()
 
     try:
         completion_data = {
@@ -185,9 +313,9 @@ def mark_crawl_as_complete(task_ids):
         }
 
         s3_client.put_object(
-            Bucket=S3_BUCKET_NAME,
+            Bucket=aws_config.S3_BUCKET_NAME,
             Key="status/crawl_completed.json",
-            Body=json.dumps(completion_data),
+            Body=orjson.dumps(completion_data) if orjson else json.dumps(completion_data, separators=(',', ':')),
             ContentType='application/json'
         )
         print("Crawl session marked as complete in S3")
@@ -196,14 +324,14 @@ def mark_crawl_as_complete(task_ids):
 
 # Add the S3 counting function as well
 def count_s3_objects(prefix):
-    """Count objects in S3 with a given prefix"""
-    from aws_config import S3_BUCKET_NAME, s3_client
+    """Count stored pages (content JSON objects) in S3 with a given prefix"""
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=prefix
-        )
-        return response.get('KeyCount', 0)
+        # The DynamoDB counter is a single read instead of a paginated listing
+        if prefix == aws_config.S3_OUTPUT_PREFIX:
+            count = aws_config.get_content_count()
+            if count is not None:
+                return count
+        return sum(1 for item in aws_config.iter_objects(prefix) if item['Key'].endswith('.json'))
     except Exception as e:
         print(f"Error counting S3 objects: {e}")
         return 0
@@ -234,48 +362,95 @@ def start_crawler(args):
     if args.output_dir:
         config['output_dir'] = args.output_dir
 
-    # Save updated config
-    save_config(config)
     print_config(config)
 
+    # Save updated config (skipped when no argument changed it) while Celery loads;
+    # start_crawl reads it back, so it waits for the save below
+    save_thread = threading.Thread(target=save_config, args=(config,))
+    save_thread.start()
+
     # Start the crawler
     print(f"\nStarting distributed web crawler with Celery...")
     print(f"Using {config['num_crawlers']} crawler workers and {config['num_indexers']} indexer workers")
 
     try:
-        # Check node health
-        check_node_health()
-
-        # Submit initial tasks
+        # Check node health in the background; it only warns, so it need not hold up
+        # the Celery import and task submission below
+        health_check = threading.Thread(target=check_node_health, daemon=True)
+        health_check.start()
+
+        # Submit initial tasks (importing the coordinator loads Celery and the task modules)
+        from coordinator import start_crawl
+        save_thread.join()
+        started_at = time.time()
         task_ids = start_crawl()
+        health_check.join()
         print(f"Submitted {len(task_ids)} initial crawling tasks")
 
         # Monitor tasks if requested
         if not args.no_monitor:
-            monitor_tasks(task_ids)
+            monitor_tasks(task_ids, started_at=started_at)
 
     except Exception as e:
         print(f"Error starting crawler: {e}")
 
-def check_node_health():
-    """Check if crawler and indexer nodes are healthy"""
-    try:
-        from distributed_config import CRAWLER_IP, INDEXER_IP
+def _get_http_session():
+    """Return the shared HTTP session used for node and OpenSearch requests"""
+    global _http_session
+    if _http_session is None:
         import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        _http_session = requests.Session()
+        # Keep connections (and OpenSearch TLS sessions) open between requests. A pooled
+        # connection the server has since closed fails on connect, so retry that once;
+        # read timeouts are not retried so a hung node still costs a single timeout.
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=1, read=0, backoff_factor=0.1)
+        )
+        _http_session.mount("http://", adapter)
+        _http_session.mount("https://", adapter)
+    return _http_session
 
-        # Check crawler node
-        try:
-            crawler_resp = requests.get(f"http://{CRAWLER_IP}:8080/health", timeout=5)
-            crawler_status = "OK" if crawler_resp.status_code == 200 else "ERROR"
-        except Exception:
-            crawler_status = "DOWN"
+def _node_probes():
+    """Health check requests for the crawler and indexer nodes, as name -> (method, url, auth)"""
+    from distributed_config import CRAWLER_IP, INDEXER_IP
+    return {
+        "crawler": ("GET", f"http://{CRAWLER_IP}:8080/health", None),
+        "indexer": ("GET", f"http://{INDEXER_IP}:8080/health", None),
+    }
+
+def _run_probes(probes, timeout):
+    """Send health check requests concurrently
 
-        # Check indexer node
+    Takes a dict of name -> (method, url, auth) and returns a dict of
+    name -> HTTP status code, or None if the endpoint is unreachable.
+    """
+    session = _get_http_session()
+
+    def probe(method, url, auth):
         try:
-            indexer_resp = requests.get(f"http://{INDEXER_IP}:8080/health", timeout=5)
-            indexer_status = "OK" if indexer_resp.status_code == 200 else "ERROR"
+            return session.request(method, url, auth=auth, timeout=timeout).status_code
         except Exception:
-            indexer_status = "DOWN"
+            return None
+
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {executor.submit(probe, *request): name for name, request in probes.items()}
+        return {futures[future]: future.result() for future in as_completed(futures)}
+
+def check_node_health():
+    """Check if crawler and indexer nodes are healthy"""
+    from distributed_config import HEALTH_CHECK_TIMEOUT
+    try:
+        codes = _run_probes(_node_probes(), timeout=HEALTH_CHECK_TIMEOUT)
+        statuses = {
+            name: "DOWN" if code is None else "OK" if code == 200 else "ERROR"
+            for name, code in codes.items()
+        }
+        crawler_status = statuses["crawler"]
+        indexer_status = statuses["indexer"]
 
         print(f"Node Health Check - Crawler: {crawler_status}, Indexer: {indexer_status}")
 
@@ -294,99 +469,44 @@ def show_status(args):
         print("Note: Detailed task inspection is not available with AWS SQS.")
 
         # Show S3 storage status
-        from aws_config import S3_BUCKET_NAME, S3_OUTPUT_PREFIX, ensure_aws_clients
-        ensure_aws_clients()
-
-        from aws_config import s3_client
-
         try:
             # Count processed URLs in S3
-            response = s3_client.list_objects_v2(
-                Bucket=S3_BUCKET_NAME,
-                Prefix=S3_OUTPUT_PREFIX
-            )
-
-            processed_count = 0
-            if 'Contents' in response:
-                processed_count = sum(1 for item in response['Contents'] if item['Key'].endswith('.json'))
+            processed_count = count_s3_objects(aws_config.S3_OUTPUT_PREFIX)
 
             print(f"\nProcessed URLs (in S3): {processed_count}")
-            print(f"S3 Bucket: {S3_BUCKET_NAME}")
+            print(f"S3 Bucket: {aws_config.S3_BUCKET_NAME}")
 
-            # Check crawler and indexer node health through API endpoints
-            from distributed_config import CRAWLER_IP, INDEXER_IP
-            import requests
-
-            try:
-                crawler_status = "UNKNOWN"
-                try:
-                    r = requests.get(f"http://{CRAWLER_IP}:8080/health", timeout=2)
-                    crawler_status = "RUNNING" if r.status_code == 200 else "ERROR"
-                except:
-                    crawler_status = "DOWN"
-
-                indexer_status = "UNKNOWN"
-                try:
-                    r = requests.get(f"http://{INDEXER_IP}:8080/health", timeout=2)
-                    indexer_status = "RUNNING" if r.status_code == 200 else "ERROR"
-                except:
-                    indexer_status = "DOWN"
-
-                print(f"\nCrawler node: {crawler_status}")
-                print(f"Indexer node: {indexer_status}")
-            except:
-                print("Could not check node health")
-
-            # Try to check OpenSearch status
+            # Check crawler and indexer node health through API endpoints, together
+            # with the OpenSearch cluster, so the wait is the slowest probe, not the sum
             try:
-                from distributed_config import OPENSEARCH_ENDPOINT
-                from requests_aws4auth import AWS4Auth
-                from distributed_config import AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, OPENSEARCH_USER, OPENSEARCH_PASS
-                import requests
-
-                opensearch_status = "DOWN"
-
-                # Determine auth method
-                auth_method = "aws4auth"  # Default
-                try:
-                    with open("opensearch_auth_method.txt", "r") as f:
-                        auth_method = f.read().strip()
-                except:
-                    pass
-
-                if auth_method == "aws4auth":
-                    auth = AWS4Auth(
-                        AWS_ACCESS_KEY_ID,
-                        AWS_SECRET_ACCESS_KEY,
-                        AWS_REGION,
-                        'es'
+                probes = _node_probes()
+
+                from distributed_config import OPENSEARCH_ENDPOINT, HEALTH_CHECK_TIMEOUT
+                if OPENSEARCH_ENDPOINT:
+                    # HEAD with local=true answers from the contacted node without
+                    # waiting on cluster-wide state
+                    probes["opensearch"] = (
+                        "HEAD",
+                        f"{OPENSEARCH_ENDPOINT}/_cluster/health?local=true&timeout=1s",
+                        aws_config.get_opensearch_auth()
                     )
 
-                    try:
-                        response = requests.get(
-                            f"{OPENSEARCH_ENDPOINT}/_cluster/health",
-                            auth=auth,
-                            timeout=3
-                        )
-                        opensearch_status = "OK" if response.status_code == 200 else "ERROR"
-                    except:
-                        opensearch_status = "DOWN"
+                codes = _run_probes(probes, timeout=HEALTH_CHECK_TIMEOUT)
+
+                def node_status(code):
+                    return "DOWN" if code is None else "RUNNING" if code == 200 else "ERROR"
+
+                print(f"\nCrawler node: {node_status(codes['crawler'])}")
+                print(f"Indexer node: {node_status(codes['indexer'])}")
+
+                if "opensearch" in codes:
+                    code = codes["opensearch"]
+                    opensearch_status = "DOWN" if code is None else "OK" if code == 200 else "ERROR"
+                    print(f"OpenSearch status: {opensearch_status}")
                 else:
-                    # Basic auth
-                    try:
-                        response = requests.get(
-                            f"{OPENSEARCH_ENDPOINT}/_cluster/health",
-                            auth=(OPENSEARCH_USER, OPENSEARCH_PASS),
-                            timeout=3
-                        )
-                        opensearch_status = "OK" if response.status_code == 200 else "ERROR"
-                    except:
-                        opensearch_status = "DOWN"
-
-                print(f"OpenSearch status: {opensearch_status}")
-
-            except Exception as es_err:
-                print(f"Could not check OpenSearch status: {es_err}")
+                    print("OpenSearch status: NOT CONFIGURED")
+            except Exception as probe_err:
+                print(f"Could not check node health: {probe_err}")
 
         except Exception as e:
             print(f"Error getting S3 details: {e}")
@@ -418,40 +538,55 @@ def purge_data(args):
     # 1. Purge S3 content
     try:
         print("Purging content from S3...")
-        from aws_config import S3_BUCKET_NAME, S3_OUTPUT_PREFIX, ensure_aws_clients
-        ensure_aws_clients()
-        from aws_config import s3_client
+        s3_client = _get_s3()
 
-        # List objects in output directory
-        paginator = s3_client.get_paginator('list_objects_v2')
-        page_iterator = paginator.paginate(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=S3_OUTPUT_PREFIX
-        )
-
-        # Count total objects
-        total_objects = 0
-        for page in page_iterator:
-            if 'Contents' in page:
-                total_objects += len(page['Contents'])
+        def delete_batch(batch):
+            # Quiet mode only reports failed keys, keeping responses small
+            response = s3_client.delete_objects(
+                Bucket=aws_config.S3_BUCKET_NAME,
+                Delete={'Objects': batch, 'Quiet': True}
+            )
+            return len(batch) - len(response.get('Errors', []))
 
+        # Each listed page (up to 1000 keys, the delete_objects limit) is deleted while
+        # the next page is being listed; the semaphore bounds the pages held in memory
+        paginator = s3_client.get_paginator('list_objects_v2')
+        in_flight = threading.BoundedSemaphore(32)
+        progress_lock = threading.Lock()
+        progress = {'listed': 0, 'deleted': 0}
+
+        def batch_done(future):
+            in_flight.release()
+            with progress_lock:
+                if not future.exception():
+                    progress['deleted'] += future.result()
+                print(f"Deleted {progress['deleted']}/{progress['listed']} objects...", end="\r")
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = []
+            for page in paginator.paginate(Bucket=aws_config.S3_BUCKET_NAME, Prefix=aws_config.S3_OUTPUT_PREFIX):
+                batch = [{'Key': obj['Key']} for obj in page.get('Contents', [])]
+                if not batch:
+                    continue
+                in_flight.acquire()
+                with progress_lock:
+                    progress['listed'] += len(batch)
+                future = executor.submit(delete_batch, batch)
+                future.add_done_callback(batch_done)
+                futures.append(future)
+
+        total_objects = progress['listed']
         if total_objects == 0:
             print("No content found in S3 output directory.")
         else:
-            print(f"Found {total_objects} objects to delete")
-
-            # Delete objects in batches
-            deleted_count = 0
-            for page in paginator.paginate(Bucket=S3_BUCKET_NAME, Prefix=S3_OUTPUT_PREFIX):
-                if 'Contents' in page:
-                    objects_to_delete = [{'Key': obj['Key']} for obj in page['Contents']]
-                    s3_client.delete_objects(
-                        Bucket=S3_BUCKET_NAME,
-                        Delete={'Objects': objects_to_delete}
-                    )
-                    deleted_count += len(objects_to_delete)
-                    print(f"Deleted {deleted_count}/{total_objects} objects...", end="\r")
+            errors = [future.exception() for future in futures if future.exception()]
+            deleted_count = progress['deleted']
             print(f"\nSuccessfully deleted {deleted_count} objects from S3.")
+            if deleted_count < total_objects:
+                print(f"Failed to delete {total_objects - deleted_count} objects.")
+                if errors:
+                    print(f"First error: {errors[0]}")
+                success = False
     except Exception as e:
         print(f"Error purging S3 data: {e}")
         success = False
@@ -459,17 +594,11 @@ def purge_data(args):
     # 2. Clear DynamoDB table
     try:
         print("\nClearing DynamoDB table...")
-        from aws_config import DYNAMODB_TABLE_NAME, ensure_aws_clients
-        ensure_aws_clients()
-        from aws_config import dynamodb_client
-
-        # Instead of deleting individual items, recreate the table
-        # This is much faster for complete purges
-        from aws_config import fix_dynamodb_table
-        if fix_dynamodb_table(force_recreate=True):
-            print("Successfully recreated DynamoDB table.")
+        # Batch-deletes the items of a small table, recreates a large one
+        if aws_config.clear_dynamodb_table():
+            print("Successfully cleared DynamoDB table.")
         else:
-            print("Failed to recreate DynamoDB table.")
+            print("Failed to clear DynamoDB table.")
             success = False
     except Exception as e:
         print(f"Error clearing DynamoDB table: {e}")
@@ -481,36 +610,18 @@ def purge_data(args):
         from distributed_config import OPENSEARCH_ENDPOINT
 
         if OPENSEARCH_ENDPOINT:
-            # Determine which authentication method to use
-            auth_method = "aws4auth"  # Default
-            try:
-                with open("opensearch_auth_method.txt", "r") as f:
-                    auth_method = f.read().strip()
-            except (FileNotFoundError, IOError):
-                pass
-
             # Load config to get index name
             from crawler_config import CrawlerConfig
             config = CrawlerConfig().get_config()
             index_name = config.get('elasticsearch_index', 'webcrawler')
 
-            # Get OpenSearch connection
-            from distributed_config import AWS_REGION, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY
-            from distributed_config import OPENSEARCH_USER, OPENSEARCH_PASS
-            from requests_aws4auth import AWS4Auth
-            import requests
-
-            if auth_method == "aws4auth":
-                auth = AWS4Auth(AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_REGION, 'es')
-                delete_response = requests.delete(
-                    f"{OPENSEARCH_ENDPOINT}/{index_name}",
-                    auth=auth
-                )
-            else:
-                delete_response = requests.delete(
-                    f"{OPENSEARCH_ENDPOINT}/{index_name}",
-                    auth=(OPENSEARCH_USER, OPENSEARCH_PASS)
-                )
+            # Get OpenSearch connection (auth method cached from the last 'fix' probe)
+            session = _get_http_session()
+
+            delete_response = session.delete(
+                f"{OPENSEARCH_ENDPOINT}/{index_name}",
+                auth=aws_config.get_opensearch_auth()
+            )
 
             if delete_response.status_code in [200, 404]:
                 print(f"Successfully deleted OpenSearch index '{index_name}'.")
@@ -538,7 +649,9 @@ def search_crawler(args):
     print(f"Searching for: {args.query}")
 
     try:
-        results = search_content(args.query)
+        from search import search_content
+        # Only fetch as many hits as will be printed
+        results = search_content(args.query, size=args.limit)
 
         if not results:
             print("No results found.")
@@ -546,12 +659,13 @@ def search_crawler(args):
 
         print(f"\nFound {len(results)} results:\n")
 
-        for i, result in enumerate(results, 1):
+        # The S3 and file fallbacks don't take a size, so cap the output here too
+        for i, result in enumerate(itertools.islice(results, args.limit), 1):
             print(f"{i}. {result['title']} (Score: {result['score']:.2f})")
             print(f"   URL: {result['url']}")
             if 's3_key' in result and result['s3_key']:
                 print(f"   S3: {result['s3_key']}")
-            print(f"   Description: {result['description'][:100]}..." if len(result['description']) > 100 else result['description'])
+            print(f"   Description: {textwrap.shorten(result['description'], 100, placeholder='...')}")
 
             if "highlights" in result and "text_content" in result["highlights"]:
                 print("   Highlights:")
@@ -563,9 +677,57 @@ def search_crawler(args):
     except Exception as e:
         print(f"Error searching: {e}")
 
+# Parsers for config values given as --set KEY=VALUE
+CONFIG_VALUE_PARSERS = {
+    'seed_urls': lambda value: [url.strip() for url in value.split(',') if url.strip()],
+    'restricted_domains': lambda value: [domain.strip() for domain in value.split(',') if domain.strip()],
+    'max_depth': int,
+    'num_crawlers': int,
+    'crawler_concurrency': int,
+    'num_indexers': int,
+    'request_delay': float,
+    'timeout': int,
+}
+
+def parse_config_updates(assignments):
+    """Parse KEY=VALUE strings into a dict of typed config values
+
+    Keys must be CrawlerConfig settings. seed_urls can't be set empty, while
+    restricted_domains= clears the domain restrictions.
+    """
+    updates = {}
+    for assignment in assignments:
+        key, sep, value = assignment.partition('=')
+        key = key.strip().replace('-', '_')
+        if not sep or not key:
+            raise ValueError(f"Expected KEY=VALUE, got '{assignment}'")
+        if key not in CrawlerConfig.DEFAULT_CONFIG:
+            raise ValueError(f"Unknown setting '{key}' (settings: {', '.join(CrawlerConfig.DEFAULT_CONFIG)})")
+        parser = CONFIG_VALUE_PARSERS.get(key, str)
+        try:
+            updates[key] = parser(value.strip())
+        except ValueError:
+            raise ValueError(f"Invalid value for {key}: '{value}'")
+        if key == 'seed_urls' and not updates[key]:
+            raise ValueError("seed_urls needs at least one URL")
+    return updates
+
 def configure(args):
     """Configure crawler settings"""
     config = load_config()
+
+    if args.set:
+        # Batch edit: apply all updates and save once, without prompting
+        try:
+            updates = parse_config_updates(args.set)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        config.update(updates)
+        save_config(config)
+        print_config(config)
+        return
+
     print_config(config)
 
     if args.interactive:
@@ -616,44 +778,54 @@ def configure(args):
 
 def list_s3_content(args):
     """List content in S3 bucket"""
-    from aws_config import S3_BUCKET_NAME, S3_OUTPUT_PREFIX, ensure_aws_clients
-
-    ensure_aws_clients()
-    from aws_config import s3_client
-
-    print(f"\nContent in S3 bucket: {S3_BUCKET_NAME}")
+    print(f"\nContent in S3 bucket: {aws_config.S3_BUCKET_NAME}")
     print("-" * 50)
 
     try:
-        # List objects in the bucket with the given prefix
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=S3_OUTPUT_PREFIX
-        )
-
-        if 'Contents' not in response or not response['Contents']:
+        # Stream the listing page by page and count and display statistics in one
+        # pass, keeping only the 10 newest JSON files in a min-heap instead of
+        # holding and sorting every key. Keys are URL hashes, so key order says
+        # nothing about age and the newest files can't be fetched with StartAfter;
+        # the full listing is needed for the totals anyway.
+        object_count = 0
+        total_size = 0
+        suffix_counts = {}  # file extension -> object count
+        newest = []
+        for item in aws_config.iter_objects(aws_config.S3_OUTPUT_PREFIX):
+            object_count += 1
+            key = item['Key']
+            size = item['Size']
+            total_size += size
+            dot = key.rfind('.')
+            suffix = key[dot:] if dot != -1 else ''
+            suffix_counts[suffix] = suffix_counts.get(suffix, 0) + 1
+            if suffix == '.json':
+                entry = (item['LastModified'], key, size)
+                if len(newest) < 10:
+                    heapq.heappush(newest, entry)
+                elif entry > newest[0]:
+                    heapq.heapreplace(newest, entry)
+
+        json_count = suffix_counts.get('.json', 0)
+        txt_count = suffix_counts.get('.txt', 0)
+
+        if not object_count:
             print("No content found in S3 bucket.")
             return
 
-        # Count and display statistics
-        json_files = [item for item in response['Contents'] if item['Key'].endswith('.json')]
-        txt_files = [item for item in response['Contents'] if item['Key'].endswith('.txt')]
-
-        print(f"Found {len(json_files)} JSON files and {len(txt_files)} text files")
-        print(f"Total storage used: {sum(item['Size'] for item in response['Contents']) / (1024*1024):.2f} MB")
+        print(f"Found {json_count} JSON files and {txt_count} text files")
+        print(f"Total storage used: {total_size / (1024*1024):.2f} MB")
 
         # Display the most recent files
-        if json_files:
-            sorted_files = sorted(json_files, key=lambda x: x['LastModified'], reverse=True)
+        if newest:
             print("\nMost recent crawled pages:")
-            for i, item in enumerate(sorted_files[:10], 1):
-                key = item['Key']
-                size_kb = item['Size'] / 1024
-                last_modified = item['LastModified'].strftime('%Y-%m-%d %H:%M:%S')
+            for i, (modified, key, size) in enumerate(sorted(newest, reverse=True), 1):
+                size_kb = size / 1024
+                last_modified = modified.strftime('%Y-%m-%d %H:%M:%S')
                 print(f"{i}. {key} ({size_kb:.1f} KB, {last_modified})")
 
-            if len(sorted_files) > 10:
-                print(f"... and {len(sorted_files) - 10} more files")
+            if json_count > 10:
+                print(f"... and {json_count - 10} more files")
     except Exception as e:
         print(f"Error listing S3 content: {e}")
 
@@ -662,24 +834,32 @@ def fix_resources(args):
     print("Fixing AWS resources...")
 
     try:
-        # Initialize AWS resources
-        from aws_config import setup_aws_resources, fix_dynamodb_table
-
         # Set up resources
-        if setup_aws_resources():
+        if aws_config.setup_aws_resources():
             print("AWS resources set up successfully.")
         else:
             print("Warning: Some AWS resources could not be set up.")
 
+        # Send new S3 output to the events queue the monitor listens on
+        if aws_config.setup_s3_event_notifications():
+            print("S3 event notifications set up successfully.")
+        else:
+            print("Warning: Could not set up S3 event notifications.")
+
         # Fix DynamoDB table
-        if fix_dynamodb_table():
+        if aws_config.fix_dynamodb_table():
             print("DynamoDB table fixed successfully.")
         else:
             print("Error: Could not fix DynamoDB table.")
 
+        # Count pages already in S3, e.g. stored before the counter existed
+        if aws_config.reset_content_count():
+            print("Content counter updated from S3.")
+        else:
+            print("Warning: Could not update the content counter.")
+
         # Test OpenSearch connection
-        from aws_config import test_opensearch_connection
-        success, auth_method = test_opensearch_connection()
+        success, auth_method = aws_config.test_opensearch_connection(force=True)
         if success:
             print(f"OpenSearch connection tested successfully using {auth_method} authentication.")
         else:
@@ -688,61 +868,67 @@ def fix_resources(args):
     except Exception as e:
         print(f"Error fixing AWS resources: {e}")
 
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {value}")
+    return number
+
+# Subcommands: name -> (help, handler, [(argument flags, argument options), ...])
+COMMANDS = {
+    "start": ("Start the crawler", start_crawler, [
+        (("--seed-urls",), {"nargs": "+", "help": "Seed URLs to start crawling from"}),
+        (("--max-depth",), {"type": int, "help": "Maximum crawl depth"}),
+        (("--num-crawlers",), {"type": int, "help": "Number of crawler workers"}),
+        (("--num-indexers",), {"type": int, "help": "Number of indexer workers"}),
+        (("--request-delay",), {"type": float, "help": "Delay between requests in seconds"}),
+        (("--timeout",), {"type": int, "help": "Request timeout in seconds"}),
+        (("--output-dir",), {"help": "Output directory for crawled content"}),
+        (("--no-monitor",), {"action": "store_true", "help": "Don't monitor tasks after starting"}),
+    ]),
+    "status": ("Show crawler status", show_status, []),
+    "search": ("Search indexed content", search_crawler, [
+        (("query",), {"help": "Search query"}),
+        (("--limit",), {"type": positive_int, "default": 20, "help": "Maximum number of results to show"}),
+    ]),
+    "list": ("List crawled content in S3", list_s3_content, []),
+    "config": ("Configure crawler settings", configure, [
+        (("--interactive", "-i"), {"action": "store_true", "help": "Interactive configuration"}),
+        (("--set",), {"action": "append", "default": [], "metavar": "KEY=VALUE",
+                      "help": "Set a config value without prompting (repeatable)"}),
+    ]),
+    "purge": ("Purge all crawled data from S3, DynamoDB, and OpenSearch", purge_data, [
+        (("--force", "-f"), {"action": "store_true", "help": "Skip confirmation prompt"}),
+    ]),
+    "fix": ("Fix/initialize AWS resources", fix_resources, []),
+}
+
 def main():
     """Main entry point for the CLI"""
     parser = argparse.ArgumentParser(description="Distributed Web Crawler CLI")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
 
-    # Start command
-    start_parser = subparsers.add_parser("start", help="Start the crawler")
-    start_parser.add_argument("--seed-urls", nargs="+", help="Seed URLs to start crawling from")
-    start_parser.add_argument("--max-depth", type=int, help="Maximum crawl depth")
-    start_parser.add_argument("--num-crawlers", type=int, help="Number of crawler workers")
-    start_parser.add_argument("--num-indexers", type=int, help="Number of indexer workers")
-    start_parser.add_argument("--request-delay", type=float, help="Delay between requests in seconds")
-    start_parser.add_argument("--timeout", type=int, help="Request timeout in seconds")
-    start_parser.add_argument("--output-dir", help="Output directory for crawled content")
-    start_parser.add_argument("--no-monitor", action="store_true", help="Don't monitor tasks after starting")
-
-    # Status command
-    status_parser = subparsers.add_parser("status", help="Show crawler status")
-
-    # Search command
-    search_parser = subparsers.add_parser("search", help="Search indexed content")
-    search_parser.add_argument("query", help="Search query")
-
-    # List command for S3
-    list_parser = subparsers.add_parser("list", help="List crawled content in S3")
-
-    # Configure command
-    config_parser = subparsers.add_parser("config", help="Configure crawler settings")
-    config_parser.add_argument("--interactive", "-i", action="store_true", help="Interactive configuration")
-
-        # Purge command
-    purge_parser = subparsers.add_parser("purge", help="Purge all crawled data from S3, DynamoDB, and OpenSearch")
-    purge_parser.add_argument("--force", "-f", action="store_true", help="Skip confirmation prompt")
-
-    # Fix command for AWS resources
-    fix_parser = subparsers.add_parser("fix", help="Fix/initialize AWS resources")
+    # Every command is listed in the help, but only the requested one needs its arguments
+    requested = sys.argv[1] if len(sys.argv) > 1 else None
+    for name, (help_text, handler, arguments) in COMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        command_parser.set_defaults(func=handler)
+        if name == requested:
+            for flags, options in arguments:
+                command_parser.add_argument(*flags, **options)
 
     args = parser.parse_args()
 
-    if args.command == "start":
-        start_crawler(args)
-    elif args.command == "status":
-        show_status(args)
-    elif args.command == "search":
-        search_crawler(args)
-    elif args.command == "config":
-        configure(args)
-    elif args.command == "list":
-        list_s3_content(args)
-    elif args.command == "purge":
-        purge_data(args)
-    elif args.command == "fix":
-        fix_resources(args)
+    # Handlers import their heavy dependencies (Celery, OpenSearch) themselves
+    if hasattr(args, 'func'):
+        args.func(args)
     else:
         parser.print_help()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
\ No newline at end of file
@@ -7,20 +7,22 @@ Provides a single command to manage crawling, indexing, and searching operations
 """
 
 import os
+import re
+import signal
 import sys
 import time
 import argparse
+import heapq
 import threading
 import subprocess
-import requests
 import json
-import textwrap
-from datetime import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from tabulate import tabulate
 
 # Import crawler components
 from distributed_config import CRAWLER_IP, INDEXER_IP, MASTER_IP
-from aws_config import ensure_aws_clients, S3_BUCKET_NAME, S3_OUTPUT_PREFIX
+from aws_config import ensure_aws_clients, get_queue_url, get_queue_depth, iter_objects, S3_BUCKET_NAME, S3_OUTPUT_PREFIX
 from crawler_config import CrawlerConfig
 from search import interactive_search, search_content, print_result, print_header
 from coordinator import start_crawl
@@ -41,10 +43,8 @@ def clear_screen():
     """Clear the terminal screen"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def print_banner():
-    """Print the application banner"""
-    clear_screen()
-    banner = f"""
+# Application banner, built once rather than on every dashboard refresh
+BANNER = f"""
 {Colors.BOLD}{Colors.BLUE}╔══════════════════════════════════════════════════════════╗
 ║                                                          ║
 ║               DISTRIBUTED WEB CRAWLER CLIENT             ║
@@ -53,7 +53,19 @@ def print_banner():
 
 {Colors.CYAN}Running on AWS infrastructure with OpenSearch, DynamoDB, and S3{Colors.ENDC}
 """
-    print(banner)
+
+# Monitor output, formatted once here; the status line is filled in with
+# (time, pages, new pages, crawler queue, indexer queue, stable seconds)
+MONITOR_STATUS_TEMPLATE = ("\r[%s] Crawled pages: %d (+%d) | "
+                           "Crawler queue: %d | Indexer queue: %d | Stable for: %ds")
+CRAWL_COMPLETE_MESSAGE = f"\n\n{Colors.GREEN}✓ Crawl completed successfully!{Colors.ENDC}"
+NO_CONTENT_MESSAGE = (f"\n\n{Colors.WARNING}No new content after 60 seconds with empty queues.{Colors.ENDC}\n"
+                      f"{Colors.RED}Crawl may have failed or seed URLs weren't valid.{Colors.ENDC}")
+
+def print_banner():
+    """Print the application banner"""
+    clear_screen()
+    print(BANNER)
 
 def check_aws_credentials():
     """Check if AWS credentials are configured properly"""
@@ -69,11 +81,21 @@ def check_aws_credentials():
 
     return True
 
+# Share one SSH connection per node across commands: the first command opens a
+# master connection that stays up for 60s after the last use, so the status checks
+# repeated on every dashboard refresh skip the TCP and SSH handshakes. The socket
+# lives in the user's own ~/.ssh, named by ssh's hash of the connection (%C), so
+# other local users can't create or reuse it.
+SSH_MULTIPLEX_OPTIONS = (
+    "" if os.name == 'nt' else
+    "-o ControlMaster=auto -o ControlPersist=60s -o ControlPath=~/.ssh/cm-%C"
+)
+
 def ssh_execute(node_ip, command, return_output=True):
     """Execute a command on a remote node using SSH"""
     ssh_key_path = os.environ.get('AWS_SSH_KEY_PATH', '~/.ssh/aws-key.pem')
     ssh_user = os.environ.get('AWS_SSH_USER', 'ec2-user')
-    ssh_options = "-o StrictHostKeyChecking=no -o ConnectTimeout=5"
+    ssh_options = f"-o StrictHostKeyChecking=no -o ConnectTimeout=5 {SSH_MULTIPLEX_OPTIONS}"
 
     try:
         ssh_cmd = f"ssh {ssh_options} -i {ssh_key_path} {ssh_user}@{node_ip} '{command}'"
@@ -93,79 +115,128 @@ def ssh_execute(node_ip, command, return_output=True):
             return False, str(e)
         return False
 
+# Commands that start each node
+START_COMMANDS = {
+    "master": "bash /home/ec2-user/start_master.sh",
+    "crawler": "bash /home/ec2-user/start_crawler.sh",
+    "indexer": "bash /home/ec2-user/start_indexer.sh",
+}
+
+# Longest time to wait for started nodes to report their process running
+NODE_START_TIMEOUT = 15
+
+# Nodes checked by check_node_status: name -> (IP, process script)
+NODES = {
+    "master": (MASTER_IP, "run_master.py"),
+    "crawler": (CRAWLER_IP, "run_crawler.py"),
+    "indexer": (INDEXER_IP, "run_indexer.py"),
+}
+
+def check_node(node_ip, script):
+    """Check a single node over SSH and whether its process is running"""
+    success, output = ssh_execute(node_ip, "echo Connected")
+    if not success:
+        return {"status": "ERROR", "message": output}
+
+    # SSH connection successful, check for process
+    proc_success, proc_output = ssh_execute(
+        node_ip,
+        f"ps aux | grep {script} | grep -v grep || echo 'Not running'"
+    )
+
+    if proc_success:
+        if "Not running" in proc_output:
+            return {"status": "READY", "message": "SSH connection successful, process not running"}
+        return {"status": "RUNNING", "message": ""}
+    return {"status": "READY", "message": "SSH connection successful, but process check failed"}
+
 def check_node_status():
-    """Check status of all crawler nodes using SSH"""
-    results = {
-        "master": {"status": "ERROR", "message": "SSH connection failed"},
-        "crawler": {"status": "ERROR", "message": "SSH connection failed"},
-        "indexer": {"status": "ERROR", "message": "SSH connection failed"}
+    """Check status of all crawler nodes using SSH
+
+    The nodes are checked concurrently, so a check takes as long as the
+    slowest node rather than the sum of all of them.
+    """
+    with ThreadPoolExecutor(max_workers=len(NODES)) as executor:
+        futures = {executor.submit(check_node, ip, script): name
+                   for name, (ip, script) in NODES.items()}
+        results = {}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                results[futures[future]] = {"status": "ERROR", "message": str(e)}
+
+    # Keep the master, crawler, indexer display order
+    return {name: results[name] for name in NODES}
+
+
+# Seconds the recent-crawls listing is reused when the content counter is unavailable
+LATEST_CRAWLS_TTL = 15
+
+# Last recent-crawls listing, with the content count and time it was taken at
+_latest_crawls_cache = {"count": None, "time": 0.0, "listed": 0, "crawls": []}
+
+def list_latest_crawls(s3_client, limit=5):
+    """List the stored pages and load the most recent ones
+
+    Returns the number of stored pages and the newest pages' details.
+    """
+    # Count the pages and keep the newest in a min-heap in the same pass, instead
+    # of collecting and sorting the whole listing
+    json_count = 0
+    newest = []
+    for item in iter_objects(S3_OUTPUT_PREFIX):
+        key = item['Key']
+        if not key.endswith('.json'):
+            continue
+        json_count += 1
+        entry = (item['LastModified'], key)
+        if len(newest) < limit:
+            heapq.heappush(newest, entry)
+        elif entry > newest[0]:
+            heapq.heapreplace(newest, entry)
+
+    latest_crawls = []
+    for last_modified, key in sorted(newest, reverse=True):
+        try:
+            latest_crawls.append(read_page_summary(s3_client, key, last_modified))
+        except Exception:
+            pass
+    return json_count, latest_crawls
+
+# Stored pages are JSON objects that start with the url and title fields, ahead of
+# the full HTML, so only the first bytes of each are needed for a summary
+PAGE_SUMMARY_RANGE = 'bytes=0-4095'
+PAGE_FIELD_PATTERNS = {
+    field: re.compile(rf'"{field}":\s*("(?:[^"\\]|\\.)*")')
+    for field in ("url", "title")
+}
+
+def read_page_summary(s3_client, key, last_modified):
+    """Read the url and title of a stored page from the start of its object"""
+    obj = s3_client.get_object(
+        Bucket=S3_BUCKET_NAME,
+        Key=key,
+        Range=PAGE_SUMMARY_RANGE
+    )
+    head = obj['Body'].read().decode('utf-8', errors='ignore')
+    fields = {}
+    for field, pattern in PAGE_FIELD_PATTERNS.items():
+        match = pattern.search(head)
+        if match:
+            fields[field] = json.loads(match.group(1))
+    return {
+        "url": fields.get('url', 'Unknown URL'),
+        "title": fields.get('title', 'Unknown Title'),
+        # Pages are stored right after they are crawled
+        "timestamp": last_modified.astimezone().strftime('%Y-%m-%d %H:%M:%S')
     }
 
-    # Check Master
-    success, output = ssh_execute(MASTER_IP, "echo Connected")
-    if success:
-        # SSH connection successful, check for process
-        proc_success, proc_output = ssh_execute(
-            MASTER_IP,
-            "ps aux | grep run_master.py | grep -v grep || echo 'Not running'"
-        )
-
-        if proc_success:
-            if "Not running" in proc_output:
-                results["master"] = {"status": "READY", "message": "SSH connection successful, process not running"}
-            else:
-                results["master"] = {"status": "RUNNING", "message": ""}
-        else:
-            results["master"] = {"status": "READY", "message": "SSH connection successful, but process check failed"}
-    else:
-        results["master"] = {"status": "ERROR", "message": output}
-
-    # Check Crawler
-    success, output = ssh_execute(CRAWLER_IP, "echo Connected")
-    if success:
-        # SSH connection successful, check for process
-        proc_success, proc_output = ssh_execute(
-            CRAWLER_IP,
-            "ps aux | grep run_crawler.py | grep -v grep || echo 'Not running'"
-        )
-
-        if proc_success:
-            if "Not running" in proc_output:
-                results["crawler"] = {"status": "READY", "message": "SSH connection successful, process not running"}
-            else:
-                results["crawler"] = {"status": "RUNNING", "message": ""}
-        else:
-            results["crawler"] = {"status": "READY", "message": "SSH connection successful, but process check failed"}
-    else:
-        results["crawler"] = {"status": "ERROR", "message": output}
-
-    # Check Indexer
-    success, output = ssh_execute(INDEXER_IP, "echo Connected")
-    if success:
-        # SSH connection successful, check for process
-        proc_success, proc_output = ssh_execute(
-            INDEXER_IP,
-            "ps aux | grep run_indexer.py | grep -v grep || echo 'Not running'"
-        )
-
-        if proc_success:
-            if "Not running" in proc_output:
-                results["indexer"] = {"status": "READY", "message": "SSH connection successful, process not running"}
-            else:
-                results["indexer"] = {"status": "RUNNING", "message": ""}
-        else:
-            results["indexer"] = {"status": "READY", "message": "SSH connection successful, but process check failed"}
-    else:
-        results["indexer"] = {"status": "ERROR", "message": output}
-
-    return results
-
-
 def get_crawl_stats():
     """Get statistics about crawling progress"""
     # Initialize AWS clients
     ensure_aws_clients()
-    from aws_config import s3_client, sqs_client, SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME
+    from aws_config import s3_client, SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME, get_content_count
 
     stats = {
         "crawled_pages": 0,
@@ -174,72 +245,41 @@ def get_crawl_stats():
         "latest_crawls": []
     }
 
-    # Get crawled pages count from S3
+    # Get crawled pages count from the DynamoDB counter. Every stored page bumps
+    # it, so the S3 listing for the latest crawls is only redone once it changed
+    # (or, without the counter, once the last listing is LATEST_CRAWLS_TTL old)
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=S3_OUTPUT_PREFIX
-        )
-        if 'Contents' in response:
-            stats["crawled_pages"] = sum(1 for item in response['Contents'] if item['Key'].endswith('.json'))
-
-            # Get latest crawls
-            sorted_files = sorted(
-                [item for item in response['Contents'] if item['Key'].endswith('.json')],
-                key=lambda x: x['LastModified'],
-                reverse=True
-            )[:5]  # Get 5 most recent
-
-            for item in sorted_files:
-                try:
-                    obj = s3_client.get_object(
-                        Bucket=S3_BUCKET_NAME,
-                        Key=item['Key']
-                    )
-                    content = json.loads(obj['Body'].read().decode('utf-8'))
-                    stats["latest_crawls"].append({
-                        "url": content.get('url', 'Unknown URL'),
-                        "title": content.get('title', 'Unknown Title'),
-                        "timestamp": datetime.fromtimestamp(
-                            content.get('crawl_timestamp', 0)
-                        ).strftime('%Y-%m-%d %H:%M:%S')
-                    })
-                except Exception:
-                    pass
+        count = get_content_count()
+        cache = _latest_crawls_cache
+        if count is not None:
+            fresh = count == cache["count"]
+        else:
+            fresh = time.monotonic() - cache["time"] < LATEST_CRAWLS_TTL
+
+        if not fresh:
+            listed, latest_crawls = list_latest_crawls(s3_client)
+            cache.update(count=count, time=time.monotonic(), listed=listed, crawls=latest_crawls)
+
+        stats["crawled_pages"] = count if count is not None else cache["listed"]
+        stats["latest_crawls"] = cache["crawls"]
     except Exception as e:
         print(f"{Colors.WARNING}Error getting S3 stats: {e}{Colors.ENDC}")
 
-    # Get queue stats
-    try:
-        # Crawler queue
-        try:
-            queue_url = sqs_client.get_queue_url(QueueName=SQS_CRAWLER_QUEUE_NAME)['QueueUrl']
-            attrs = sqs_client.get_queue_attributes(
-                QueueUrl=queue_url,
-                AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
-            )
-            stats["crawl_queue"] = (
-                int(attrs['Attributes']['ApproximateNumberOfMessages']) +
-                int(attrs['Attributes']['ApproximateNumberOfMessagesNotVisible'])
-            )
-        except Exception as e:
-            print(f"{Colors.WARNING}Error getting crawler queue stats: {e}{Colors.ENDC}")
-
-        # Indexer queue
-        try:
-            queue_url = sqs_client.get_queue_url(QueueName=SQS_INDEXER_QUEUE_NAME)['QueueUrl']
-            attrs = sqs_client.get_queue_attributes(
-                QueueUrl=queue_url,
-                AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
-            )
-            stats["index_queue"] = (
-                int(attrs['Attributes']['ApproximateNumberOfMessages']) +
-                int(attrs['Attributes']['ApproximateNumberOfMessagesNotVisible'])
-            )
-        except Exception as e:
-            print(f"{Colors.WARNING}Error getting indexer queue stats: {e}{Colors.ENDC}")
-    except Exception as e:
-        print(f"{Colors.WARNING}Error getting queue stats: {e}{Colors.ENDC}")
+    # Get queue stats for both queues concurrently (queue URLs are cached per
+    # process by get_queue_url)
+    queues = {
+        "crawl_queue": ("crawler", SQS_CRAWLER_QUEUE_NAME),
+        "index_queue": ("indexer", SQS_INDEXER_QUEUE_NAME),
+    }
+    with ThreadPoolExecutor(max_workers=len(queues)) as executor:
+        futures = {executor.submit(get_queue_depth, queue_name): (stat, label)
+                   for stat, (label, queue_name) in queues.items()}
+        for future in as_completed(futures):
+            stat, label = futures[future]
+            try:
+                stats[stat] = future.result()
+            except Exception as e:
+                print(f"{Colors.WARNING}Error getting {label} queue stats: {e}{Colors.ENDC}")
 
     return stats
 
@@ -267,72 +307,21 @@ def start_all_components():
 
     print(f"\n{Colors.CYAN}Launching system components...{Colors.ENDC}")
 
-    # Track which components we're starting
-    started_components = []
-
-    # 1. Start master (if needed)
-    if status["master"]["status"] != "RUNNING":
-        print(f"Starting master node on {MASTER_IP}...")
-        success = ssh_execute(
-            MASTER_IP,
-            "bash /home/ec2-user/start_master.sh",
-            return_output=False
-        )
-
-        if success:
-            print(f"{Colors.GREEN}Master node start command executed successfully{Colors.ENDC}")
-            started_components.append("master")
-        else:
-            print(f"{Colors.RED}Failed to start master node{Colors.ENDC}")
-
-        time.sleep(2)  # Give it time to start
-
-    # 2. Start crawler (if needed)
-    if status["crawler"]["status"] != "RUNNING":
-        print(f"Starting crawler node on {CRAWLER_IP}...")
-        success = ssh_execute(
-            CRAWLER_IP,
-            "bash /home/ec2-user/start_crawler.sh",
-            return_output=False
-        )
-
-        if success:
-            print(f"{Colors.GREEN}Crawler node start command executed successfully{Colors.ENDC}")
-            started_components.append("crawler")
-        else:
-            print(f"{Colors.RED}Failed to start crawler node{Colors.ENDC}")
-
-        time.sleep(2)  # Give it time to start
-
-    # 3. Start indexer (if needed)
-    if status["indexer"]["status"] != "RUNNING":
-        print(f"Starting indexer node on {INDEXER_IP}...")
-        success = ssh_execute(
-            INDEXER_IP,
-            "bash /home/ec2-user/start_indexer.sh",
-            return_output=False
-        )
-
-        if success:
-            print(f"{Colors.GREEN}Indexer node start command executed successfully{Colors.ENDC}")
-            started_components.append("indexer")
-        else:
-            print(f"{Colors.RED}Failed to start indexer node{Colors.ENDC}")
-
-        time.sleep(2)  # Give it time to start
+    # Start the missing components in parallel
+    to_start = [name for name in NODES if status[name]["status"] != "RUNNING"]
+    started_components = start_nodes(to_start)
 
     if not started_components:
         print(f"\n{Colors.WARNING}No components needed to be started{Colors.ENDC}")
         return
 
-    # Wait for startup and check status
-    print(f"\n{Colors.CYAN}Waiting for components to initialize (10s)...{Colors.ENDC}")
-    time.sleep(10)  # Give nodes time to start up
+    # Wait until the started components are running rather than a fixed time
+    print(f"\n{Colors.CYAN}Waiting for components to initialize (up to {NODE_START_TIMEOUT}s)...{Colors.ENDC}")
+    updated_status = wait_for_nodes(started_components)
 
     # Check if processes are actually running
     print(f"\n{Colors.CYAN}Verifying component status...{Colors.ENDC}")
 
-    updated_status = check_node_status()
     success_count = 0
 
     for component in started_components:
@@ -361,6 +350,46 @@ def start_all_components():
 
     input(f"\nPress Enter to continue...")
 
+def start_nodes(names):
+    """Run the start scripts of the given nodes concurrently
+
+    Returns the names of the nodes whose start command succeeded.
+    """
+    if not names:
+        return []
+
+    for name in names:
+        print(f"Starting {name} node on {NODES[name][0]}...")
+
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        futures = {
+            name: executor.submit(ssh_execute, NODES[name][0], START_COMMANDS[name], return_output=False)
+            for name in names
+        }
+
+    started = []
+    for name, future in futures.items():
+        if future.result():
+            print(f"{Colors.GREEN}{name.capitalize()} node start command executed successfully{Colors.ENDC}")
+            started.append(name)
+        else:
+            print(f"{Colors.RED}Failed to start {name} node{Colors.ENDC}")
+    return started
+
+def wait_for_nodes(names, timeout=None, interval=2):
+    """Poll the node status until the given nodes are running or the timeout passes
+
+    Returns the last node status.
+    """
+    deadline = time.monotonic() + (timeout or NODE_START_TIMEOUT)
+    while True:
+        status = check_node_status()
+        if all(status[name]["status"] == "RUNNING" for name in names):
+            return status
+        if time.monotonic() + interval >= deadline:
+            return status
+        time.sleep(interval)
+
 # Add this helper function to get log output
 def get_last_log_lines(node_ip, log_path, lines=5):
     """Get the last few lines from a log file on a remote node"""
@@ -494,24 +523,14 @@ def start_new_crawl():
                 status_color = Colors.GREEN if info["status"] == "RUNNING" else Colors.WARNING if info["status"] == "READY" else Colors.RED
                 print(f"  - {node.capitalize()}: {status_color}{info['status']}{Colors.ENDC}")
 
-            start_nodes = input(f"\n{Colors.BOLD}Start missing nodes before crawling? (y/n): {Colors.ENDC}")
-            if start_nodes.lower() == 'y':
-                # Start nodes that are not running
-                for node, info in status.items():
-                    if info["status"] != "RUNNING":
-                        print(f"Starting {node} node...")
-                        if node == "master":
-                            ssh_execute(MASTER_IP, "bash /home/ec2-user/start_master.sh", return_output=False)
-                        elif node == "crawler":
-                            ssh_execute(CRAWLER_IP, "bash /home/ec2-user/start_crawler.sh", return_output=False)
-                        elif node == "indexer":
-                            ssh_execute(INDEXER_IP, "bash /home/ec2-user/start_indexer.sh", return_output=False)
-
-                print(f"\n{Colors.CYAN}Waiting for nodes to initialize (10s)...{Colors.ENDC}")
-                time.sleep(10)  # Give nodes time to start
-
-                # Verify nodes again
-                updated_status = check_node_status()
+            start_missing = input(f"\n{Colors.BOLD}Start missing nodes before crawling? (y/n): {Colors.ENDC}")
+            if start_missing.lower() == 'y':
+                # Start nodes that are not running, in parallel
+                started = start_nodes([node for node, info in status.items() if info["status"] != "RUNNING"])
+
+                # Wait for the nodes to come up
+                print(f"\n{Colors.CYAN}Waiting for nodes to initialize (up to {NODE_START_TIMEOUT}s)...{Colors.ENDC}")
+                updated_status = wait_for_nodes(started)
                 all_running = all(info["status"] == "RUNNING" for info in updated_status.values())
                 if not all_running:
                     print(f"\n{Colors.WARNING}Some nodes could not be started. Crawling may not work correctly.{Colors.ENDC}")
@@ -521,6 +540,7 @@ def start_new_crawl():
 
         # Start the crawl
         print(f"\n{Colors.CYAN}Starting crawler...{Colors.ENDC}")
+        started_at = time.time()
         task_ids = start_crawl()
         print(f"\n{Colors.GREEN}Crawl started with {len(task_ids)} seed tasks.{Colors.ENDC}")
 
@@ -529,7 +549,7 @@ def start_new_crawl():
         print(f"(Press Ctrl+C to stop monitoring and return to dashboard)")
 
         try:
-            monitor_crawl_completion(task_ids)
+            monitor_crawl_completion(task_ids, started_at=started_at)
         except KeyboardInterrupt:
             print(f"\n{Colors.CYAN}Monitoring stopped by user.{Colors.ENDC}")
 
@@ -537,21 +557,15 @@ def start_new_crawl():
 
 
 # Add this new function for monitoring crawl completion
-def monitor_crawl_completion(task_ids, max_runtime=1200, status_interval=5):
-    """Monitor task progress and show completion message"""
-    from aws_config import S3_BUCKET_NAME, S3_OUTPUT_PREFIX, ensure_aws_clients
-    ensure_aws_clients()
-    from aws_config import s3_client, sqs_client, SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME
+def monitor_crawl_completion(task_ids, max_runtime=1200, status_interval=5, started_at=None):
+    """Monitor task progress and show completion message
 
+    started_at is the Unix time the crawl was submitted (default: now); S3
+    events from before it don't count as progress.
+    """
     # Get initial count
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=S3_OUTPUT_PREFIX
-        )
-        initial_count = 0
-        if 'Contents' in response:
-            initial_count = sum(1 for item in response['Contents'] if item['Key'].endswith('.json'))
+        initial_count = count_crawled_pages()
 
         print(f"Initial content count in S3: {initial_count}")
 
@@ -563,80 +577,138 @@ def monitor_crawl_completion(task_ids, max_runtime=1200, status_interval=5):
         # Monitor progress
         start_time = time.time()
 
-        while True:
-            # Check timeouts
-            elapsed_time = time.time() - start_time
-            if elapsed_time > max_runtime:
-                print(f"\n{Colors.WARNING}Maximum runtime exceeded ({max_runtime}s).{Colors.ENDC}")
-                print(f"{Colors.GREEN}✓ Crawl completed or still in progress.{Colors.ENDC}")
-                break
+        # Newly stored pages are reported on the S3 events queue, when it exists
+        from aws_config import SQS_EVENTS_QUEUE_NAME, s3_event_timestamp
+        events_queue_url = get_queue_url(SQS_EVENTS_QUEUE_NAME)
+        events_since = s3_event_timestamp(start_time if started_at is None else started_at)
 
-            # Sleep before checking again
-            time.sleep(status_interval)
+        # Poll less often while nothing changes (up to once a minute); Ctrl-C sets
+        # stop_event so the wait ends immediately instead of sleeping it out. An SQS
+        # long poll can't be woken by the event, so with the events queue Ctrl-C
+        # raises KeyboardInterrupt as usual instead.
+        interval = status_interval
+        stop_event, previous_handler = threading.Event(), None
+        if not events_queue_url:
+            from crawler_cli import stop_event_on_sigint
+            stop_event, previous_handler = stop_event_on_sigint()
 
-            # Check queues and S3 for new content
-            try:
-                # Get queue counts
-                crawler_queue = get_queue_count(SQS_CRAWLER_QUEUE_NAME)
-                indexer_queue = get_queue_count(SQS_INDEXER_QUEUE_NAME)
-
-                # Get S3 count
-                response = s3_client.list_objects_v2(
-                    Bucket=S3_BUCKET_NAME,
-                    Prefix=S3_OUTPUT_PREFIX
-                )
-                current_count = 0
-                if 'Contents' in response:
-                    current_count = sum(1 for item in response['Contents'] if item['Key'].endswith('.json'))
-
-                new_items = current_count - initial_count
-
-                # If count changed, reset stability timer
-                if current_count != stable_count:
-                    stable_count = current_count
-                    stable_since = time.time()
-                    no_change_duration = 0
-                else:
-                    no_change_duration = time.time() - stable_since
+        # Threads for the per-poll AWS calls, kept for the whole monitoring session
+        executor = ThreadPoolExecutor(max_workers=3)
 
-                # Print status update
-                print(f"\r[{time.strftime('%H:%M:%S')}] Crawled pages: {current_count} (+{new_items}) | " +
-                      f"Crawler queue: {crawler_queue} | Indexer queue: {indexer_queue} | " +
-                      f"Stable for: {int(no_change_duration)}s", end="", flush=True)
+        try:
+            while True:
+                # Check timeouts
+                elapsed_time = time.time() - start_time
+                if elapsed_time > max_runtime:
+                    print(f"\n{Colors.WARNING}Maximum runtime exceeded ({max_runtime}s).{Colors.ENDC}")
+                    print(f"{Colors.GREEN}✓ Crawl completed or still in progress.{Colors.ENDC}")
+                    break
+
+                # Wait before checking again
+                if events_queue_url:
+                    # Check at most every status_interval (see the backed-off wait below)
+                    time.sleep(status_interval)
+                elif stop_event.wait(interval):
+                    print(f"\n{Colors.WARNING}Monitoring stopped by user.{Colors.ENDC}")
+                    break
+
+                # Check queues and S3 for new content
+                try:
+                    # While backed off, wake as soon as S3 reports new pages
+                    # rather than at the end of the interval
+                    if events_queue_url and interval > status_interval:
+                        wait_for_page_events(events_queue_url, interval - status_interval, events_since)
+
+                    # Get the crawled pages count and queue counts together
+                    current_count, crawler_queue, indexer_queue = poll_crawl_progress(executor)
+
+                    new_items = current_count - initial_count
+
+                    # If count changed, reset stability timer
+                    if current_count != stable_count:
+                        stable_count = current_count
+                        stable_since = time.time()
+                        no_change_duration = 0
+                        interval = status_interval
+                    else:
+                        no_change_duration = time.time() - stable_since
+                        interval = min(interval * 1.5, 60)
+
+                    # Print status update (one write per update)
+                    sys.stdout.write(MONITOR_STATUS_TEMPLATE % (
+                        time.strftime('%H:%M:%S'), current_count, new_items,
+                        crawler_queue, indexer_queue, no_change_duration
+                    ))
+                    sys.stdout.flush()
+
+                    # Completion check: no tasks in queues and content has been stable for a while
+                    if crawler_queue == 0 and indexer_queue == 0 and no_change_duration > 30 and current_count > initial_count:
+                        print(CRAWL_COMPLETE_MESSAGE)
+                        return
+
+                    # If queues are empty but no new content for a while, something might be wrong
+                    if crawler_queue == 0 and indexer_queue == 0 and current_count == initial_count and elapsed_time > 60:
+                        print(NO_CONTENT_MESSAGE)
+                        return
+
+                except Exception as e:
+                    print(f"\nError monitoring progress: {e}")
+        finally:
+            executor.shutdown(wait=False)
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
 
-                # Completion check: no tasks in queues and content has been stable for a while
-                if crawler_queue == 0 and indexer_queue == 0 and no_change_duration > 30 and current_count > initial_count:
-                    print(f"\n\n{Colors.GREEN}✓ Crawl completed successfully!{Colors.ENDC}")
-                    return
+    except Exception as e:
+        print(f"\nError setting up monitoring: {e}")
 
-                # If queues are empty but no new content for a while, something might be wrong
-                if crawler_queue == 0 and indexer_queue == 0 and current_count == initial_count and elapsed_time > 60:
-                    print(f"\n\n{Colors.WARNING}No new content after 60 seconds with empty queues.{Colors.ENDC}")
-                    print(f"{Colors.RED}Crawl may have failed or seed URLs weren't valid.{Colors.ENDC}")
-                    return
+def wait_for_page_events(queue_url, timeout, since):
+    """Wait up to timeout seconds for S3 to report pages stored at or after since
 
-            except Exception as e:
-                print(f"\nError monitoring progress: {e}")
+    Returns True as soon as a page event arrives, or False on timeout. The
+    events are consumed (see aws_config.receive_page_events), so this must not
+    run alongside crawler_cli's monitor_tasks.
+    """
+    from aws_config import receive_page_events
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if receive_page_events(queue_url, since, max(1, min(20, int(remaining)))):
+            return True
 
-    except Exception as e:
-        print(f"\nError setting up monitoring: {e}")
+def count_crawled_pages():
+    """Count crawled pages in S3 from the DynamoDB counter item
+
+    The counter is a single read; a paginated listing of the output prefix is
+    only needed before the first page has been stored.
+    """
+    from aws_config import get_content_count
+    count = get_content_count()
+    if count is not None:
+        return count
+
+    return sum(1 for item in iter_objects(S3_OUTPUT_PREFIX) if item['Key'].endswith('.json'))
 
 def get_queue_count(queue_name):
     """Get approximate count of messages in an SQS queue"""
     try:
-        from aws_config import sqs_client
-        queue_url = sqs_client.get_queue_url(QueueName=queue_name)['QueueUrl']
-        attrs = sqs_client.get_queue_attributes(
-            QueueUrl=queue_url,
-            AttributeNames=['ApproximateNumberOfMessages', 'ApproximateNumberOfMessagesNotVisible']
-        )
-        return (
-            int(attrs['Attributes']['ApproximateNumberOfMessages']) +
-            int(attrs['Attributes']['ApproximateNumberOfMessagesNotVisible'])
-        )
+        return get_queue_depth(queue_name)
     except Exception:
         return 0
 
+def poll_crawl_progress(executor):
+    """Get the crawled pages count and the crawler and indexer queue counts
+
+    The three reads are independent, so they run concurrently on the executor
+    and a poll takes as long as the slowest of them.
+    """
+    from aws_config import SQS_CRAWLER_QUEUE_NAME, SQS_INDEXER_QUEUE_NAME
+    count_future = executor.submit(count_crawled_pages)
+    crawler_future = executor.submit(get_queue_count, SQS_CRAWLER_QUEUE_NAME)
+    indexer_future = executor.submit(get_queue_count, SQS_INDEXER_QUEUE_NAME)
+    return count_future.result(), crawler_future.result(), indexer_future.result()
+
 def search_interface():
     """Interface for searching crawled content"""
     interactive_search()  # Use the existing interactive search
@@ -811,4 +883,5 @@ def main():
         print(f"\n{Colors.RED}Error: {e}{Colors.ENDC}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
\ No newline at end of file
@@ -2,25 +2,43 @@
 # filepath: crawler_config.py
 
 import os
+import re
+import copy
 import json
 import logging
 from aws_config import get_config_from_s3, store_config_in_s3
 
+# Compiled restricted-domain filters, keyed by the tuple of domains
+_domain_filters = {}
+
+def get_domain_filter(restricted_domains):
+    """Return a compiled regex matching URLs that contain any restricted domain, or None"""
+    if not restricted_domains:
+        return None
+    key = tuple(restricted_domains)
+    if key not in _domain_filters:
+        _domain_filters[key] = re.compile('|'.join(map(re.escape, key)))
+    return _domain_filters[key]
+
 class CrawlerConfig:
     """Configuration manager for the distributed web crawler using S3 storage"""
 
+    # Every configuration setting, with its default value
+    DEFAULT_CONFIG = {
+        'seed_urls': [],
+        'restricted_domains': [],
+        'max_depth': 3,
+        'num_crawlers': 2,
+        'crawler_concurrency': 200,  # Concurrent fetches per crawler worker (gevent pool)
+        'num_indexers': 1,
+        'output_dir': 'output',
+        'request_delay': 1.0,
+        'timeout': 10
+    }
+
     def __init__(self, config_file='crawler_config.json'):
         self.config_file = config_file
-        self.config = {
-            'seed_urls': [],
-            'restricted_domains': [],
-            'max_depth': 3,
-            'num_crawlers': 2,
-            'num_indexers': 1,
-            'output_dir': 'output',
-            'request_delay': 1.0,
-            'timeout': 10
-        }
+        self.config = copy.deepcopy(self.DEFAULT_CONFIG)
 
         # Load existing config if available
         self.load_config()
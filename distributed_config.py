@@ -7,9 +7,8 @@ Using AWS services (SQS, DynamoDB, S3) exclusively
 """
 import os
 import logging
+from urllib.parse import quote
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Node IP addresses - for health checks
@@ -17,6 +16,12 @@ MASTER_IP = os.environ.get("MASTER_IP", "172.31.21.220")
 CRAWLER_IP = os.environ.get("CRAWLER_IP", "172.31.23.169")
 INDEXER_IP = os.environ.get("INDEXER_IP", "172.31.20.112")
 
+# Node health check timeouts as (connect, read). The pooled sessions retry a failed
+# connect once, so an unreachable node is reported DOWN after about 2 seconds. The
+# read limit is longer than the indexer's own 5 second OpenSearch check, so a slow
+# OpenSearch shows up as the indexer's 503 rather than as the indexer being DOWN.
+HEALTH_CHECK_TIMEOUT = (1.0, 6.0)
+
 # AWS OpenSearch Service configuration
 OPENSEARCH_ENDPOINT = os.environ.get("OPENSEARCH_ENDPOINT", "")
 OPENSEARCH_USER = os.environ.get("OPENSEARCH_USER", "elastic")
@@ -34,6 +39,20 @@ else:
     logger.warning("OpenSearch endpoint not provided. Search functionality will be limited.")
     ELASTICSEARCH_URL = None
 
+# Optional Redis (e.g. ElastiCache) for per-host crawl rate limiting; tasks stay on SQS
+REDIS_URL = os.environ.get("REDIS_URL", "")
+
+# Redis client shared within a process, created on first use
+_redis_client = None
+
+def get_redis_client():
+    """Return the shared Redis client, or None if REDIS_URL isn't set"""
+    global _redis_client
+    if REDIS_URL and _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(REDIS_URL, socket_timeout=2)
+    return _redis_client
+
 # Node type - set appropriately on each instance
 NODE_TYPE = os.environ.get("NODE_TYPE", "master")  # Change to "crawler" or "indexer" on respective nodes
 
@@ -41,9 +60,13 @@ NODE_TYPE = os.environ.get("NODE_TYPE", "master")  # Change to "crawler" or "ind
 from aws_config import (
     SQS_CRAWLER_QUEUE_NAME,
     SQS_INDEXER_QUEUE_NAME,
-    DYNAMODB_TABLE_NAME
+    DYNAMODB_TABLE_NAME,
+    CELERY_BROKER_URL
 )
 
 # Celery configuration with SQS and DynamoDB
-CELERY_BROKER = f"sqs://{AWS_ACCESS_KEY_ID}:{AWS_SECRET_ACCESS_KEY}@{AWS_REGION}"
-CELERY_BACKEND = f"dynamodb://{AWS_ACCESS_KEY_ID}:{AWS_SECRET_ACCESS_KEY}@{AWS_REGION}/{DYNAMODB_TABLE_NAME}"
\ No newline at end of file
+CELERY_BROKER = CELERY_BROKER_URL
+CELERY_BACKEND = (
+    f"dynamodb://{quote(AWS_ACCESS_KEY_ID or '', safe='')}:{quote(AWS_SECRET_ACCESS_KEY or '', safe='')}"
+    f"@{AWS_REGION}/{DYNAMODB_TABLE_NAME}"
+)
\ No newline at end of file
@@ -73,9 +73,10 @@ def start_health_server():
 def start_crawler_workers():
     """Start crawler workers connecting to AWS SQS"""
     config = CrawlerConfig().get_config()
-    num_workers = config.get('num_crawlers', 4)
+    # Crawling is I/O bound, so one gevent worker runs many fetches concurrently
+    num_workers = config.get('crawler_concurrency', 200)
 
-    logger.info(f"Starting {num_workers} crawler workers connected to AWS SQS")
+    logger.info(f"Starting crawler worker with {num_workers} greenlets connected to AWS SQS")
 
     # THIS IS THE CRITICAL PART - Import tasks FIRST
     import tasks
@@ -92,8 +93,11 @@ def start_crawler_workers():
         '--loglevel=info',
         '--concurrency', str(num_workers),
         '-Q', 'crawler',  # Only process crawler tasks
+        # kombu sizes each SQS ReceiveMessage by the free prefetch slots (at most
+        # 10); one slot per greenlet is already plenty to receive full batches
+        '--prefetch-multiplier', os.environ.get('CELERY_PREFETCH_MULTIPLIER', '1'),
         '-n', f'crawler@{NODE_TYPE}',
-        '-P', 'solo',
+        '-P', 'gevent',
         # Add these options to disable features that need dynamic queues
         '--without-gossip',
         '--without-mingle',
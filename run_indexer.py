@@ -13,6 +13,7 @@ import subprocess
 import requests
 import threading
 import json
+from concurrent.futures import ThreadPoolExecutor
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from crawler_config import CrawlerConfig
 from distributed_config import NODE_TYPE
@@ -65,9 +66,14 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
             task_stats = {"pending": "unknown", "active": "unknown"}
             try:
                 from celery_app import app
-                inspector = app.control.inspect()
-                active = inspector.active()
-                reserved = inspector.reserved()
+                # Each inspect call is a broadcast that waits out its timeout for
+                # replies, so send both at once and cap the wait at a second
+                inspector = app.control.inspect(timeout=1.0)
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    active_future = executor.submit(inspector.active)
+                    reserved_future = executor.submit(inspector.reserved)
+                    active = active_future.result()
+                    reserved = reserved_future.result()
 
                 active_count = 0
                 if active:
@@ -193,6 +199,7 @@ def start_indexer_workers():
         '--loglevel=info',
         '--concurrency', str(num_workers),
         '-Q', 'indexer',  # Only process indexer tasks
+        '--prefetch-multiplier', '1',  # Indexing tasks are long, don't reserve extra
         '-n', f'indexer@{NODE_TYPE}',
         '-P', 'solo',
         '--without-gossip',
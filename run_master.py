@@ -13,8 +13,9 @@ import requests
 import threading
 import logging
 from http.server import BaseHTTPRequestHandler, HTTPServer  # Missing import for HTTP server
-from crawler_config import CrawlerConfig
-from distributed_config import CRAWLER_IP, INDEXER_IP, MASTER_IP
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from distributed_config import CRAWLER_IP, INDEXER_IP, HEALTH_CHECK_TIMEOUT
 from aws_config import setup_aws_resources, fix_dynamodb_table
 
 # Set up logging
@@ -28,6 +29,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pooled HTTP session for the periodic node health checks, so each check
+# reuses the open connections instead of reconnecting every 30 seconds
+http_session = requests.Session()
+http_session.mount("http://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=2,
+    max_retries=Retry(total=1, read=0, backoff_factor=0.1)
+))
+
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """Simple HTTP handler for health checks"""
     def do_GET(self):
@@ -62,14 +72,14 @@ def health_check_worker():
         try:
             # Check crawler node health
             try:
-                crawler_resp = requests.get(f"http://{CRAWLER_IP}:8080/health", timeout=5)
+                crawler_resp = http_session.get(f"http://{CRAWLER_IP}:8080/health", timeout=HEALTH_CHECK_TIMEOUT)
                 crawler_status = "OK" if crawler_resp.status_code == 200 else "ERROR"
             except Exception:
                 crawler_status = "DOWN"
 
             # Check indexer node health
             try:
-                indexer_resp = requests.get(f"http://{INDEXER_IP}:8080/health", timeout=5)
+                indexer_resp = http_session.get(f"http://{INDEXER_IP}:8080/health", timeout=HEALTH_CHECK_TIMEOUT)
                 indexer_status = "OK" if indexer_resp.status_code == 200 else "ERROR"
             except Exception:
                 indexer_status = "DOWN"
@@ -110,13 +120,9 @@ def monitor_tasks_without_inspector(task_ids, max_runtime=1200, status_interval=
 
 def count_s3_objects(prefix):
     """Count objects in S3 with a given prefix"""
-    from aws_config import S3_BUCKET_NAME, s3_client
+    from aws_config import iter_objects
     try:
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=prefix
-        )
-        return response.get('KeyCount', 0)
+        return sum(1 for _ in iter_objects(prefix))
     except Exception as e:
         print(f"Error counting S3 objects: {e}")
         return 0
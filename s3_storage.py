@@ -6,16 +6,13 @@ S3 storage for crawled content.
 Provides functions to save, retrieve, and manage crawled content in S3.
 """
 
-import boto3
 import hashlib
 import json
 import logging
 import time
 from botocore.exceptions import ClientError
-from aws_config import AWS_REGION, AWS_ACCESS_KEY, AWS_SECRET_KEY, S3_BUCKET_NAME, S3_OUTPUT_PREFIX, S3_INPUT_PREFIX, ensure_aws_clients
+from aws_config import AWS_REGION, AWS_ACCESS_KEY, AWS_SECRET_KEY, S3_BUCKET_NAME, S3_OUTPUT_PREFIX, S3_INPUT_PREFIX, ensure_aws_clients, increment_content_count, iter_objects
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize S3 client
@@ -51,6 +48,9 @@ def save_to_s3(content, url):
         )
         logger.info(f"Saved content to S3: {url} -> s3://{S3_BUCKET_NAME}/{key}")
 
+        # Keep a running count so status checks don't have to list the bucket
+        increment_content_count()
+
         # Also save a text version for easy reading
         if 'text_content' in content:
             text_content = (
@@ -119,17 +119,8 @@ def list_stored_content(input_dir=False):
     prefix = S3_INPUT_PREFIX if input_dir else S3_OUTPUT_PREFIX
 
     try:
-        # List objects in the bucket with the given prefix
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=prefix
-        )
-
-        if 'Contents' not in response:
-            return []
-
         # Extract .json files only (ignore .txt versions)
-        return [item['Key'] for item in response['Contents'] if item['Key'].endswith('.json')]
+        return [item['Key'] for item in iter_objects(prefix) if item['Key'].endswith('.json')]
     except Exception as e:
         logger.error(f"Error listing content in S3: {e}")
         return []
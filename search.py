@@ -9,23 +9,17 @@ Provides a user-friendly interface to search indexed content with highlighting a
 import difflib
 from elasticsearch import Elasticsearch
 from elasticsearch.connection import RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
-import requests
-import hashlib
+import heapq
 import logging
 import os
 import json
 import argparse
-import boto3
 import time
 import sys
-from botocore.exceptions import ClientError
 from datetime import datetime
 import textwrap
 import re
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # ANSI color codes for terminal styling
@@ -117,8 +111,11 @@ def search_files(query, output_dir='output', show_progress=True):
     config = CrawlerConfig().get_config()
     return search_s3(query, config, show_progress)
 
-def search_content(query, config_file='crawler_config.json', show_progress=True, advanced=False):
-    """Search indexed content using OpenSearch with improved formatting"""
+def search_content(query, config_file='crawler_config.json', show_progress=True, advanced=False, size=None):
+    """Search indexed content using OpenSearch with improved formatting
+
+    size overrides the number of hits OpenSearch returns.
+    """
     from crawler_config import CrawlerConfig
 
     if show_progress:
@@ -129,9 +126,7 @@ def search_content(query, config_file='crawler_config.json', show_progress=True,
         # Try to use distributed config if available
         try:
             from distributed_config import (
-                ELASTICSEARCH_URL, OPENSEARCH_ENDPOINT,
-                AWS_REGION, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY,
-                OPENSEARCH_USER, OPENSEARCH_PASS
+                ELASTICSEARCH_URL, OPENSEARCH_ENDPOINT
             )
             es_host = ELASTICSEARCH_URL
             use_aws = bool(OPENSEARCH_ENDPOINT)
@@ -162,38 +157,15 @@ def search_content(query, config_file='crawler_config.json', show_progress=True,
 
         # Create ES connection with authentication
         if use_aws:
-            # Determine authentication method from file if available
-            auth_method = "aws4auth"  # Default
-            try:
-                with open("opensearch_auth_method.txt", "r") as f:
-                    auth_method = f.read().strip()
-            except (FileNotFoundError, IOError):
-                pass
-
-            if auth_method == "aws4auth":
-                # AWS OpenSearch connection with IAM auth
-                aws_auth = AWS4Auth(
-                    AWS_ACCESS_KEY_ID,
-                    AWS_SECRET_ACCESS_KEY,
-                    AWS_REGION,
-                    'es'  # Service name for OpenSearch
-                )
-                es = Elasticsearch(
-                    hosts=[es_host],
-                    http_auth=aws_auth,
-                    use_ssl=es_host.startswith('https'),
-                    verify_certs=True,
-                    connection_class=RequestsHttpConnection
-                )
-            else:
-                # Basic auth fallback
-                es = Elasticsearch(
-                    hosts=[es_host],
-                    http_auth=(OPENSEARCH_USER, OPENSEARCH_PASS),
-                    use_ssl=es_host.startswith('https'),
-                    verify_certs=True,
-                    connection_class=RequestsHttpConnection
-                )
+            # Auth method and AWS4Auth signer are cached in aws_config
+            from aws_config import get_opensearch_auth
+            es = Elasticsearch(
+                hosts=[es_host],
+                http_auth=get_opensearch_auth(),
+                use_ssl=es_host.startswith('https'),
+                verify_certs=True,
+                connection_class=RequestsHttpConnection
+            )
         else:
             # Standard Elasticsearch connection
             es = Elasticsearch(
@@ -247,6 +219,9 @@ def search_content(query, config_file='crawler_config.json', show_progress=True,
                 "size": 10
             }
 
+        if size:
+            search_query["size"] = size
+
         # Check if index exists
         if not es.indices.exists(index=index_name):
             if show_progress:
@@ -310,22 +285,22 @@ def search_content(query, config_file='crawler_config.json', show_progress=True,
 def search_s3(query, config, show_progress=True):
     """Search content in S3 bucket with clean, readable results"""
     from aws_config import S3_BUCKET_NAME, S3_OUTPUT_PREFIX
-    from aws_config import ensure_aws_clients, s3_client
+    from aws_config import ensure_aws_clients, iter_objects
 
     if show_progress:
         print(f"{Colors.CYAN}Searching in S3 bucket: {S3_BUCKET_NAME}{Colors.ENDC}")
 
+    # The client global is only set once the clients are initialized
     ensure_aws_clients()
+    from aws_config import s3_client
     start_time = time.time()
 
     try:
-        # List all JSON files in the output directory
-        response = s3_client.list_objects_v2(
-            Bucket=S3_BUCKET_NAME,
-            Prefix=S3_OUTPUT_PREFIX,
-        )
+        # Process only JSON files
+        json_files = [item['Key'] for item in iter_objects(S3_OUTPUT_PREFIX)
+                      if item['Key'].endswith('.json')]
 
-        if 'Contents' not in response:
+        if not json_files:
             if show_progress:
                 print(f"{Colors.WARNING}⚠️ No content found in S3 bucket{Colors.ENDC}")
             return []
@@ -333,10 +308,6 @@ def search_s3(query, config, show_progress=True):
         results = []
         query_terms = [term.lower() for term in query.split()]
 
-        # Process only JSON files
-        json_files = [item['Key'] for item in response['Contents']
-                    if item['Key'].endswith('.json')]
-
         if show_progress:
             print(f"{Colors.CYAN}Scanning {len(json_files)} files in S3...{Colors.ENDC}")
             # Simple progress indicator
@@ -437,16 +408,14 @@ def search_s3(query, config, show_progress=True):
             sys.stdout.write("\r" + " " * 60 + "\r")
             sys.stdout.flush()
 
-        # Sort by score descending
-        results.sort(key=lambda x: x["score"], reverse=True)
         search_time = time.time() - start_time
 
         if show_progress:
             print(f"{Colors.GREEN}S3 search completed in {search_time:.2f} seconds{Colors.ENDC}")
             print(f"{Colors.BOLD}Found {len(results)} results in S3{Colors.ENDC}")
 
-        # Return top results
-        return results[:15]
+        # Return the top results by score, without sorting every match
+        return heapq.nlargest(15, results, key=lambda x: x["score"])
 
     except Exception as e:
         if show_progress:
@@ -649,4 +618,5 @@ def main():
         print(f"\n{Colors.CYAN}Tip: Run with --interactive (-i) for an enhanced search experience{Colors.ENDC}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
\ No newline at end of file
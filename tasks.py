@@ -13,24 +13,17 @@ from bs4 import BeautifulSoup
 import hashlib
 import os
 import logging
-from celery_app import app
-import json
+from celery.signals import worker_process_shutdown, worker_shutdown
+from celery_app import app, send_tasks_batch
 from elasticsearch import Elasticsearch
 from elasticsearch.connection import RequestsHttpConnection
-from requests_aws4auth import AWS4Auth
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Import configuration from distributed_config
 try:
     from distributed_config import (
-        ELASTICSEARCH_URL, NODE_TYPE, OPENSEARCH_ENDPOINT,
-        AWS_REGION, AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY
+        ELASTICSEARCH_URL, NODE_TYPE, OPENSEARCH_ENDPOINT, get_redis_client
     )
     DISTRIBUTED_MODE = True
     USE_AWS_OPENSEARCH = bool(OPENSEARCH_ENDPOINT)
@@ -41,18 +34,92 @@ except ImportError:
     DISTRIBUTED_MODE = False
     USE_AWS_OPENSEARCH = False
     NODE_TYPE = "local"
+    get_redis_client = lambda: None
     logger.info("Running in local mode")
 
 # Import S3 storage - required
 from s3_storage import save_to_s3, check_content_exists
+from aws_config import (
+    get_config_from_s3, get_opensearch_auth, flush_content_count,
+    SQS_CRAWLER_QUEUE_NAME, SQS_VISIBILITY_TIMEOUTS
+)
+from crawler_config import get_domain_filter
 USE_S3_STORAGE = True
 logger.info("Using S3 for content storage")
 
-@app.task(bind=True, name='tasks.crawl')
-def crawl(self, url, depth=0, config=None):
-    """Crawler task that fetches web pages"""
+# Longest a crawl task waits in the worker for its host's fetch slot before it is
+# requeued, and how often it is requeued before giving up
+MAX_HOST_SLOT_WAIT = 30
+HOST_BUSY_MAX_RETRIES = 50
+
+# Longest countdown for a requeued crawl task. Workers hold countdown messages
+# unacknowledged, so countdown plus slot wait and fetch must stay within the
+# crawler queue's visibility timeout or SQS delivers the task a second time.
+MAX_REQUEUE_COUNTDOWN = int(SQS_VISIBILITY_TIMEOUTS[SQS_CRAWLER_QUEUE_NAME]) // 2
+
+DEFAULT_CONFIG = {'request_delay': 1.0, 'timeout': 10, 'max_depth': 3, 'output_dir': 'output'}
+
+# Crawl configurations loaded from S3 in this process, keyed by config ID
+_config_cache = {}
+
+def load_config(config):
+    """Resolve a task's config argument: a config ID, a full config dict or None"""
     if not config:
-        config = {'request_delay': 1.0, 'timeout': 10, 'max_depth': 3, 'output_dir': 'output'}
+        return DEFAULT_CONFIG
+    if isinstance(config, dict):
+        return config
+
+    if config not in _config_cache:
+        loaded = get_config_from_s3(config)
+        if loaded is None:
+            raise ValueError(f"Crawl configuration {config} not found in S3")
+        _config_cache[config] = loaded
+    return _config_cache[config]
+
+# Reserves the next free fetch time for a host: returns the reserved time and
+# moves the host's next free time delay ms past it (all times in ms)
+_RESERVE_HOST_SLOT = """
+local now = tonumber(ARGV[1])
+local delay = tonumber(ARGV[2])
+local slot = math.max(now, tonumber(redis.call('GET', KEYS[1]) or '0'))
+redis.call('SET', KEYS[1], slot + delay, 'PX', slot + delay - now + 1000)
+return slot
+"""
+
+def reserve_host_slot(host, delay):
+    """Reserve a fetch from host, at most one per delay seconds across all workers
+
+    Returns the Unix time to fetch at. Without Redis every fetch simply
+    waits delay seconds in this worker.
+    """
+    client = get_redis_client()
+    if client is not None:
+        try:
+            now = int(time.time() * 1000)
+            slot = client.eval(_RESERVE_HOST_SLOT, 1, f"crawl_host:{host}", now, max(1, int(delay * 1000)))
+            return int(slot) / 1000
+        except Exception as e:
+            logger.warning(f"Per-host rate limiting unavailable, using the fixed delay: {e}")
+    return time.time() + delay
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def flush_page_count(**kwargs):
+    """Add pages stored since the last periodic flush to the counter before the worker exits"""
+    flush_content_count()
+
+@app.task(bind=True, name='tasks.crawl', ignore_result=True,
+          rate_limit=os.environ.get('CRAWL_RATE_LIMIT', '50/s'))
+def crawl(self, url, depth=0, config=None, slot=None):
+    """Crawler task that fetches web pages
+
+    config is the ID of a configuration stored in S3 (or, for older
+    messages, the configuration itself); it is passed on to child tasks as is.
+    slot is the fetch time already reserved for the URL's host, set when the
+    task is requeued to wait for it.
+    """
+    config_ref = config
+    config = load_config(config)
 
     logger.info(f"Crawler {self.request.id} processing URL: {url} (depth {depth})")
 
@@ -61,10 +128,21 @@ def crawl(self, url, depth=0, config=None):
         logger.info(f"URL already processed in S3, skipping: {url}")
         return {'status': 'skipped', 'url': url, 'reason': 'already_processed'}
 
-    try:
-        # Add delay to prevent overloading servers
-        time.sleep(config['request_delay'])
+    # Politeness: wait for this host's next free fetch slot. When the host is busy
+    # for a long time, requeue the task with its slot rather than holding the
+    # worker; the slot is reserved only once, so requeues don't push it back.
+    if slot is None:
+        slot = reserve_host_slot(urlparse(url).netloc, config['request_delay'])
+    wait = slot - time.time()
+    if wait > MAX_HOST_SLOT_WAIT:
+        raise self.retry(
+            args=(url, depth, config_ref), kwargs={'slot': slot},
+            countdown=min(wait - MAX_HOST_SLOT_WAIT / 2, MAX_REQUEUE_COUNTDOWN),
+            max_retries=HOST_BUSY_MAX_RETRIES
+        )
+    time.sleep(max(0, wait))
 
+    try:
         # Fetch the webpage content
         headers = {'User-Agent': 'DistributedWebCrawler/1.0'}
         response = requests.get(url, headers=headers, timeout=config['timeout'])
@@ -114,7 +192,7 @@ def crawl(self, url, depth=0, config=None):
                 's3_key': s3_key,  # Only send the S3 key, not full content
                 'depth': depth
             }
-            index.delay(indexer_message, url, config)
+            index.delay(indexer_message, url, config_ref)
 
         else:
             logger.error(f"Failed to save content to S3 for {url}")
@@ -122,15 +200,19 @@ def crawl(self, url, depth=0, config=None):
 
         # Schedule crawling of new URLs if not at max depth
         if depth < config['max_depth']:
-            for new_url in new_urls:
-                # Check domain restrictions if any
-                allowed = True
-                if config.get('restricted_domains'):
-                    allowed = not any(domain in new_url for domain in config['restricted_domains'])
-
-                if allowed:
-                    # Send to crawl queue with incremented depth
-                    crawl.delay(new_url, depth + 1, config)
+            # Check domain restrictions if any (one precompiled regex per config)
+            domain_filter = get_domain_filter(config.get('restricted_domains'))
+            next_calls = [
+                (new_url, depth + 1, config_ref)
+                for new_url in new_urls
+                if domain_filter is None or not domain_filter.search(new_url)
+            ]
+
+            # Send to crawl queue with incremented depth, 10 messages per SQS request
+            send_tasks_batch(
+                crawl, next_calls,
+                parent_id=self.request.id, root_id=self.request.root_id or self.request.id
+            )
 
         logger.info(f"Crawler completed processing URL: {url}")
         return {'status': 'success', 'url': url, 'new_urls_count': len(new_urls)}
@@ -139,10 +221,11 @@ def crawl(self, url, depth=0, config=None):
         logger.error(f"Error processing URL {url}: {e}")
         return {'status': 'error', 'url': url, 'error': str(e)}
 
-@app.task(name='tasks.index')
+@app.task(name='tasks.index', ignore_result=True)
 def index(content_indexer, url, config):
     """Indexer task that processes and indexes web content using OpenSearch and S3"""
     logger.info(f"Indexer processing content from: {url}")
+    config = load_config(config)
 
     success = False
     error_message = None
@@ -166,47 +249,14 @@ def index(content_indexer, url, config):
             es_host = ELASTICSEARCH_URL
             logger.info(f"Using OpenSearch at {es_host}")
 
-            # Determine which authentication method to use
-            auth_method = "aws4auth"  # Default to AWS4Auth
-            try:
-                # Try to read from helper file if it exists
-                with open("opensearch_auth_method.txt", "r") as f:
-                    auth_method = f.read().strip()
-            except (FileNotFoundError, IOError):
-                pass
-
-            if auth_method == "aws4auth":
-                # Use AWS4Auth for OpenSearch
-                aws_auth = AWS4Auth(
-                    AWS_ACCESS_KEY_ID,
-                    AWS_SECRET_ACCESS_KEY,
-                    AWS_REGION,
-                    'es'
-                )
-                es = Elasticsearch(
-                    hosts=[es_host],
-                    http_auth=aws_auth,
-                    use_ssl=es_host.startswith('https'),
-                    verify_certs=True,
-                    connection_class=RequestsHttpConnection
-                )
-            else:
-                # Fall back to basic auth
-                try:
-                    from distributed_config import OPENSEARCH_USER, OPENSEARCH_PASS
-                    es_user = OPENSEARCH_USER
-                    es_pass = OPENSEARCH_PASS
-                except ImportError:
-                    es_user = config.get('elasticsearch_user', 'elastic')
-                    es_pass = config.get('elasticsearch_password', 'elastic')
-
-                es = Elasticsearch(
-                    hosts=[es_host],
-                    http_auth=(es_user, es_pass),
-                    use_ssl=es_host.startswith('https'),
-                    verify_certs=True,
-                    connection_class=RequestsHttpConnection
-                )
+            # Auth method is read once per process; the AWS4Auth signer is shared
+            es = Elasticsearch(
+                hosts=[es_host],
+                http_auth=get_opensearch_auth(),
+                use_ssl=es_host.startswith('https'),
+                verify_certs=True,
+                connection_class=RequestsHttpConnection
+            )
 
             # Create index if it doesn't exist
             index_name = config.get('elasticsearch_index', 'webcrawler')
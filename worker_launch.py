@@ -4,20 +4,31 @@ Worker launcher script that ensures tasks are registered properly.
 """
 import os
 import sys
+import time
+import random
 
-# Import tasks BEFORE importing app
-import tasks
-from tasks import crawl, index
-from celery_app import app
+from celery import maybe_patch_concurrency
 
-# Print registered tasks for debugging
-print("Registered tasks:")
-for task_name in app.tasks.keys():
-    if not task_name.startswith('celery.'):
-        print(f"  - {task_name}")
+# Apply gevent/eventlet monkey patches for '-P gevent' before anything else
+# imports sockets (the celery command does this itself, worker_main doesn't)
+maybe_patch_concurrency(sys.argv)
+
+from celery_app import app, load_tasks
 
 # Start the worker process
 if __name__ == '__main__':
+    # Import tasks BEFORE starting the worker
+    load_tasks()
+
+    # Print registered tasks for debugging
+    print("Registered tasks:")
+    for task_name in app.tasks.keys():
+        if not task_name.startswith('celery.'):
+            print(f"  - {task_name}")
+
+    # Spread out broker connections when many workers restart at once
+    time.sleep(random.uniform(0, float(os.environ.get('WORKER_STARTUP_JITTER', 5))))
+
     argv = sys.argv[1:]  # Skip the script name
     argv = ['worker'] + argv
-    app.worker_main(argv)
\ No newline at end of file
+    app.worker_main(argv)